@@ -0,0 +1,86 @@
+"""Benchmark da leitura das fotos: pygame.image.load x decodificação reduzida (src/image_loader.py).
+
+    python -m benchmarks.bench_decode --widths 1080 1920 --limit 10
+
+Para cada largura de janela mede a latência (mediana por foto) e o pico de
+memória (RSS) de cada leitor. Cada leitor roda num processo novo, para o pico
+de um não contaminar o do outro.
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import statistics
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from src.renditions import GUESSING_DIR
+
+
+def _read_all(paths):
+    files = []
+    for path in paths:
+        with open(path, "rb") as file:
+            files.append((path, file.read()))
+    return files
+
+
+def _run_loader(loader, paths, target_width, repeat):
+    """Executa num processo separado. Retorna (ms por foto, pico de RSS em MB, tamanho da saída)."""
+    import io
+
+    import pygame
+
+    from src.image_loader import load_surface
+
+    files = _read_all(paths)
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    samples = []
+    size = None
+    for _ in range(repeat):
+        for path, data in files:
+            start = time.perf_counter()
+            if loader == "pygame":
+                surface = pygame.image.load(io.BytesIO(data), path)
+            else:
+                surface = load_surface(data, path, target_width)
+            samples.append((time.perf_counter() - start) * 1000)
+            size = surface.get_size()
+            del surface
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return statistics.median(samples), peak / 1024, (peak - baseline_rss) / 1024, size
+
+
+def measure(loader, paths, target_width, repeat):
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        return pool.apply(_run_loader, (loader, paths, target_width, repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default=GUESSING_DIR)
+    parser.add_argument("--widths", type=int, nargs="+", default=[1080, 1280, 1920, 2560])
+    parser.add_argument("--limit", type=int, default=10, help="quantas fotos usar")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = sorted(os.path.join(args.source, name) for name in os.listdir(args.source)
+                   if name.lower().endswith((".jpg", ".jpeg")))[:args.limit]
+    if not paths:
+        raise SystemExit(f"Nenhum JPEG em {args.source}")
+    print(f"{len(paths)} fotos de {args.source}, {args.repeat} repetições")
+
+    base_ms, base_peak, base_delta, base_size = measure("pygame", paths, None, args.repeat)
+    print(f"{'pygame.image.load':<28} {base_ms:8.1f} ms/foto  pico RSS {base_peak:7.1f} MB "
+          f"(+{base_delta:.1f})  {base_size[0]}x{base_size[1]}")
+
+    for width in args.widths:
+        ms, peak, delta, size = measure("reduced", paths, width, args.repeat)
+        print(f"{'load_surface (janela ' + str(width) + ')':<28} {ms:8.1f} ms/foto  pico RSS {peak:7.1f} MB "
+              f"(+{delta:.1f})  {size[0]}x{size[1]}  x{base_ms / ms:.1f}")
+
+
+if __name__ == "__main__":
+    main()
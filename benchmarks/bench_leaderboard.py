@@ -0,0 +1,57 @@
+"""Benchmark do ranking com históricos grandes.
+
+    python -m benchmarks.bench_leaderboard --rows 1000000 --players 50000
+"""
+import argparse
+import random
+import time
+
+from src.leaderboard import DATE_FORMAT, Leaderboard
+
+
+def fake_rows(rows, players, seed=0):
+    """Partidas em ordem cronológica, espalhadas pelos últimos 60 dias."""
+    rng = random.Random(seed)
+    start = time.time() - 60 * 86400
+    step = 60 * 86400 / rows
+    for i in range(rows):
+        date = time.strftime(DATE_FORMAT, time.localtime(start + i * step))
+        yield f"jogador {rng.randrange(players)}", rng.randrange(301), 10.0, date
+
+
+def timed(label, function, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<28} {elapsed * 1e6:12.1f} us")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--players", type=int, default=50_000)
+    args = parser.parse_args()
+
+    rows = list(fake_rows(args.rows, args.players))
+
+    start = time.perf_counter()
+    leaderboard = Leaderboard.from_rows(rows)
+    print(f"{'carga inicial':<28} {time.perf_counter() - start:12.2f} s ({args.rows} partidas)")
+
+    now = time.strftime(DATE_FORMAT)
+    counter = iter(range(10 ** 9))
+    timed("record (por partida)", lambda: leaderboard.record(f"jogador {next(counter) % args.players}", 150, now), 10_000)
+    timed("rank", lambda: leaderboard.rank("jogador 42"), 10_000)
+    timed("best_of", lambda: leaderboard.best_of("jogador 42"), 10_000)
+    timed("top(5)", lambda: leaderboard.top(5), 10_000)
+    timed("top_today(5)", lambda: leaderboard.top_today(5), 100)
+    timed("top_this_week(5)", lambda: leaderboard.top_this_week(5), 10)
+
+    # Referência: varredura completa, como seria sem o índice
+    timed("varredura completa (ref.)", lambda: max(rows, key=lambda row: row[1]), 3)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Benchmark do desenho (sem janela, SDL_VIDEODRIVER=dummy).
+
+Mede as funções de desenho do jogo e do mark_images numa matriz de tamanhos
+de janela, tamanhos de foto e estados (foto/mapa, mini mapa com/sem hover).
+Os casos `frame/<backend>/...` medem o quadro inteiro, até a apresentação,
+no backend de superfícies e no de texturas (src/render_backend.py).
+Os resultados podem ser gravados como baseline e comparados depois:
+
+    python -m benchmarks.bench_render --save-baseline
+    python -m benchmarks.bench_render --threshold 0.25
+
+A comparação sai com código 1 se algum caso ficar mais lento que a baseline
+além do limite.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import main as game
+import mark_images
+from src.dirty import DirtyTracker
+from src.minimap import crop_center
+from src.place import Place
+from src.render_backend import SurfaceBackend, TextureBackend
+from src.text_cache import get_font
+from src.viewport import ZOOM_LEVELS
+
+BASELINE_PATH = os.path.join("benchmarks", "baselines", "render.json")
+
+WINDOW_SIZES = {
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4k": (3840, 2160),
+}
+PHOTO_SIZES = {
+    "photo1080": (1920, 1080),
+    "photo12mp": (4032, 3024),
+}
+MAP_SIZE = (2160, 3840)  # Mapa em pé, rolado na vertical
+
+# Diferenças abaixo disso (ms) são ruído, mesmo que passem do limite relativo
+MIN_DELTA_MS = 0.05
+
+
+def fake_image(size, seed=0):
+    """Superfície com blocos de cor, para o smoothscale não pegar atalhos."""
+    rng = random.Random(seed)
+    surface = pygame.Surface(size).convert()
+    block = 64
+    for x in range(0, size[0], block):
+        for y in range(0, size[1], block):
+            surface.fill((rng.randrange(256), rng.randrange(256), rng.randrange(256)), (x, y, block, block))
+    return surface
+
+
+@contextmanager
+def mouse_at(position):
+    """O driver dummy ignora set_pos: troca get_pos enquanto o caso roda."""
+    original = pygame.mouse.get_pos
+    pygame.mouse.get_pos = lambda: position
+    try:
+        yield
+    finally:
+        pygame.mouse.get_pos = original
+
+
+@contextmanager
+def using_backend(backend):
+    """Troca o backend do jogo só enquanto o caso roda (os outros casos continuam no de sempre)."""
+    original = game.display.backend
+    game.display.backend = backend
+    try:
+        yield
+    finally:
+        game.display.backend = original
+
+
+def measure(function, repeat, warmup=2):
+    """Mediana (ms) de `repeat` chamadas, depois de aquecer os caches."""
+    for _ in range(warmup):
+        function()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def cases(images, font):
+    """Gera (nome, função) para cada combinação da matriz."""
+    map_image = images["map"]
+
+    for window_name, window in WINDOW_SIZES.items():
+        screen = pygame.display.set_mode(window)
+        W, H = window
+        texture = TextureBackend()
+        texture.screen = texture.open(window, "bench")
+        backends = (SurfaceBackend(), texture)
+
+        for photo_name in PHOTO_SIZES:
+            photo = images[photo_name]
+            for showing_map in (False, True):
+                active, mini, mini_is_map = (map_image, photo, False) if showing_map else (photo, map_image, True)
+                state = "map" if showing_map else "photo"
+                for hover in (False, True):
+                    suffix = f"{window_name}/{photo_name}/{state}/{'hover' if hover else 'idle'}"
+
+                    def game_scene(screen=screen, W=W, H=H, active=active, mini=mini, mini_is_map=mini_is_map,
+                                   hover=hover):
+                        game.minimap.set_hover(hover)
+                        game.viewport.set_image(active, (W, H))
+                        game.draw_scene(screen, game.viewport, mini, mini_is_map, W, H)
+
+                    # No mark_images o hover vem do mouse (minimap.update dentro do draw_scene)
+                    mini_rect = mark_images.minimap.rect(mini, mini_is_map, W, H)
+                    mouse = mini_rect.center if hover else (0, 0)
+
+                    def mark_scene(screen=screen, W=W, H=H, active=active, mini=mini, mini_is_map=mini_is_map,
+                                   hover=hover, mouse=mouse):
+                        mark_images.minimap.set_hover(hover)
+                        with mouse_at(mouse):
+                            mark_images.draw_scene(screen, active, mini, mini_is_map, W, H, 0)
+
+                    yield f"draw_scene/{suffix}", game_scene
+                    yield f"mark_images.draw_scene/{suffix}", mark_scene
+
+            # Quadro completo (cena + pin + apresentação) em cada backend
+            for backend in backends:
+                for showing_map in (False, True):
+                    active, mini, mini_is_map = (map_image, photo, False) if showing_map else (photo, map_image, True)
+                    target = backend.screen if backend.name != "surface" else screen
+
+                    def frame(backend=backend, screen=target, W=W, H=H, active=active, mini=mini,
+                              mini_is_map=mini_is_map, dirty=DirtyTracker()):
+                        with using_backend(backend):
+                            game.minimap.set_hover(False)
+                            game.viewport.set_image(active, (W, H))
+                            dirty.mark_all()
+                            backend.begin(screen, dirty)
+                            game.draw_scene(screen, game.viewport, mini, mini_is_map, W, H)
+                            backend.draw_sprite(screen, images["pin"], (W // 2 - 25, H // 2 - 50, 50, 50))
+                            backend.present(screen, dirty)
+
+                    state = "map" if showing_map else "photo"
+                    yield f"frame/{backend.name}/{window_name}/{photo_name}/{state}", frame
+
+            # Zoom no meio da foto: só os tiles visíveis são desenhados
+            for level in (2, 4):
+                def zoomed(screen=screen, W=W, H=H, photo=photo, level=level):
+                    game.viewport.set_image(photo, (W, H))
+                    game.viewport.zoom_at(level - game.viewport.level, (W // 2, H // 2))
+                    game.viewport.draw(screen)
+
+                yield f"Viewport.draw/{window_name}/{photo_name}/zoom{ZOOM_LEVELS[level]:g}", zoomed
+
+        yield (f"draw_guess_and_next_buttons/{window_name}",
+               lambda screen=screen, W=W, H=H: game.draw_guess_and_next_buttons(screen, W, H, font))
+        yield (f"mark_images.draw_redo_and_next_buttons/{window_name}",
+               lambda screen=screen, W=W, H=H: mark_images.draw_redo_and_next_buttons(screen, W, H, font))
+        yield (f"draw_text_with_border/{window_name}",
+               lambda screen=screen, W=W, H=H: game.draw_text_with_border(
+                   screen, "Excelente! 287 pontos", font, (255, 255, 255), (0, 0, 0), W // 2, H // 2, 2))
+
+        place = Place(path="", name="bench", position=(W * 0.4, H * 0.6), radius=H // 8)
+        place.set_screen(screen)
+        place.get_score((W * 0.7, H * 0.3))
+        yield f"Place.draw_circle/{window_name}", lambda place=place: place.draw_circle()
+        yield f"Place.draw_line/{window_name}", lambda place=place: place.draw_line(font=font)
+        texture.close()
+
+    for name in (*PHOTO_SIZES, "map"):
+        image = images[name]
+        yield f"crop_center/{name}", lambda image=image: crop_center(image, 16 / 9)
+
+
+def run(repeat, pattern=None):
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((64, 64))
+
+    images = {name: fake_image(size, seed) for seed, (name, size) in enumerate(PHOTO_SIZES.items())}
+    images["map"] = fake_image(MAP_SIZE, seed=99)
+    images["pin"] = fake_image((128, 128), seed=7)
+    font = get_font("Arial", 32, bold=True)
+
+    results = {}
+    for name, function in cases(images, font):
+        if pattern and pattern not in name:
+            continue
+        results[name] = measure(function, repeat)
+        print(f"{name:<64} {results[name]:9.3f} ms")
+
+    pygame.quit()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Lista os casos mais lentos que a baseline: [(nome, antes, agora)]."""
+    regressions = []
+    for name, median_ms in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if median_ms > before * (1 + threshold) and median_ms - before > MIN_DELTA_MS:
+            regressions.append((name, before, median_ms))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--filter", help="só os casos que contêm este texto")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="grava os resultados como nova baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="piora relativa tolerada antes de falhar (0.25 = 25%%)")
+    parser.add_argument("--output", help="grava os resultados desta execução em JSON")
+    args = parser.parse_args()
+
+    results = run(args.repeat, args.filter)
+    report = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.platform(),
+        "repeat": args.repeat,
+        "results_ms": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        if os.path.exists(args.baseline) and args.filter:
+            # Com filtro, só atualiza os casos medidos agora
+            with open(args.baseline) as file:
+                previous = json.load(file)
+            report["results_ms"] = {**previous["results_ms"], **results}
+        with open(args.baseline, "w") as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+        print(f"Baseline salva em {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"Sem baseline em {args.baseline}; rode com --save-baseline para criar.")
+        return
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    regressions = compare(results, baseline["results_ms"], args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} caso(s) mais lentos que a baseline (limite {args.threshold:.0%}):")
+        for name, before, after in regressions:
+            print(f"  {name:<62} {before:8.3f} -> {after:8.3f} ms ({after / before - 1:+.0%})")
+        sys.exit(1)
+    print(f"\nNenhuma regressão acima de {args.threshold:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
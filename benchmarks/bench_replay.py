@@ -0,0 +1,151 @@
+"""Reproduz partidas gravadas sem janela e mede a vazão do jogo inteiro.
+
+Grave uma partida com `python main.py --record-input=partida.jsonl.gz` e depois:
+
+    python -m benchmarks.bench_replay partida.jsonl.gz --sessions 1000
+    python -m benchmarks.bench_replay partida.jsonl.gz --realtime
+    python -m benchmarks.bench_replay partida.jsonl.gz --renderer=texture
+    python -m benchmarks.bench_replay partida.jsonl.gz --sessions 50 --memory-telemetry=memoria.json
+    python -m benchmarks.bench_replay partida.jsonl.gz --sessions 1000 --kiosk
+
+Cada sessão passa pela tela inicial, pelas rodadas de `run()` e pela tela de
+pontuação. Com `--kiosk` as sessões reaproveitam o mesmo `Game` (janela,
+fontes, mapa, ranking), como no modo quiosque; sem ele, cada uma abre e fecha
+o jogo inteiro. A pontuação de todas as sessões precisa bater com a da gravação;
+se não bater, sai com código 1.
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import main as game
+from src.input_source import Recording, inputs
+from src.kiosk import kiosk
+from src.memory_telemetry import memory
+from src.profiler import percentile
+from src.render_backend import BACKENDS
+
+
+class KioskSessions:
+    """Partidas reproduzidas num `Game` só, aberto na primeira e reaproveitado nas outras."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.game = None
+
+    def play(self):
+        if self.game is None:
+            self.game = game.Game(db_path=self.db_path, csv_path=None)
+        try:
+            return self.game.play()
+        except SystemExit:
+            # run() já fechou o pygame: a próxima sessão abre outro Game
+            self.game = None
+            raise
+        finally:
+            kiosk.end_session()
+
+    def close(self):
+        if self.game is not None:
+            self.game.close()
+            self.game = None
+
+
+def replay_session(recording, db_path, realtime=False, sessions=None):
+    """Uma partida reproduzida. Retorna o resultado do main() (ou None se não terminou).
+
+    Com `sessions` (um `KioskSessions`), joga no jogo já aberto em vez de chamar o main().
+    """
+    inputs.replay(recording, realtime)
+    try:
+        if sessions is None:
+            result = game.main(db_path=db_path, csv_path=None)
+        else:
+            result = sessions.play()
+    except SystemExit:
+        # A gravação acabou (ou fechou a janela) antes da tela de pontuação
+        result = None
+    finally:
+        inputs.live()
+    if inputs.exhausted:
+        return None
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recordings", nargs="+", help="arquivos gravados com --record-input")
+    parser.add_argument("--sessions", type=int, default=20, help="sessões por gravação")
+    parser.add_argument("--realtime", action="store_true", help="respeita os 30 fps em vez de ir o mais rápido possível")
+    # O main() lê a opção direto do sys.argv (src/render_backend.py)
+    parser.add_argument("--renderer", choices=BACKENDS, default="surface", help="backend de desenho")
+    parser.add_argument("--memory-telemetry", nargs="?", const="memory_profile.json", metavar="ARQUIVO",
+                        help="mede a memória a cada rodada/partida (src/memory_telemetry.py)")
+    parser.add_argument("--kiosk", action="store_true", help="sessões seguidas no mesmo Game (modo quiosque)")
+    parser.add_argument("--tracemalloc", action="store_true", help="mede também o pico de memória Python (mais lento)")
+    args = parser.parse_args()
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    if args.memory_telemetry:
+        memory.enable(args.memory_telemetry)
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        # Histórico descartável: as partidas simuladas não entram no ranking de verdade
+        db_path = os.path.join(tmp, "scores.db")
+
+        kiosk_sessions = KioskSessions(db_path) if args.kiosk else None
+        for path in args.recordings:
+            recording = Recording.load(path)
+            expected = recording.result["points"] if recording.result else None
+            round_times = []
+            scores = set()
+            incomplete = 0
+
+            start = time.perf_counter()
+            for _ in range(args.sessions):
+                result = replay_session(recording, db_path, args.realtime, kiosk_sessions)
+                if result is None:
+                    incomplete += 1
+                    continue
+                scores.add(result["points"])
+                round_times.extend(result["rounds"])
+            elapsed = time.perf_counter() - start
+
+            print(f"{path}:")
+            print(f"  sessões: {args.sessions} em {elapsed:.2f} s ({args.sessions / elapsed:.1f} partidas/s)"
+                  f", partida original: {recording.duration:.1f} s")
+            if round_times:
+                round_times.sort()
+                print(f"  rodada: p50 {percentile(round_times, 50) * 1000:.1f} ms,"
+                      f" p95 {percentile(round_times, 95) * 1000:.1f} ms")
+            print(f"  pontuação: {sorted(scores)} (gravada: {expected})")
+
+            mismatch = len(scores) > 1 or (expected is not None and scores != {expected})
+            if incomplete:
+                print(f"  ERRO: {incomplete} sessão(ões) não chegaram ao fim")
+            if mismatch:
+                print("  ERRO: a pontuação reproduzida não bate")
+            if incomplete or mismatch:
+                failures += 1
+        if kiosk_sessions is not None:
+            kiosk_sessions.close()
+
+    # ru_maxrss é em KB no Linux
+    print(f"Pico de memória (RSS): {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+    if args.tracemalloc:
+        print(f"Pico de memória Python (tracemalloc): {tracemalloc.get_traced_memory()[1] / 2 ** 20:.1f} MB")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
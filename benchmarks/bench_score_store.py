@@ -0,0 +1,58 @@
+"""Benchmark de concorrência do histórico de pontuações.
+
+Vários processos gravam partidas ao mesmo tempo no mesmo banco; no final
+confere se nenhuma linha se perdeu.
+
+    python -m benchmarks.bench_score_store --writers 16 --rows 500
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from multiprocessing import Pool
+
+from src.score_store import ScoreStore
+
+
+def _write(args):
+    db_path, writer_id, rows = args
+    store = ScoreStore(db_path, csv_path=None)
+    start = time.perf_counter()
+    for i in range(rows):
+        store.add(f"kiosk-{writer_id}", i % 500, 12.5, time.strftime("%Y-%m-%d %H:%M:%S"))
+    elapsed = time.perf_counter() - start
+    store.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--rows", type=int, default=500, help="Partidas por processo")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "scores.db")
+        ScoreStore(db_path, csv_path=None).close()
+
+        start = time.perf_counter()
+        with Pool(args.writers) as pool:
+            per_writer = pool.map(_write, [(db_path, i, args.rows) for i in range(args.writers)])
+        elapsed = time.perf_counter() - start
+
+        store = ScoreStore(db_path, csv_path=None)
+        count = store.count()
+        store.close()
+
+    expected = args.writers * args.rows
+    print(f"{args.writers} processos x {args.rows} partidas: {count}/{expected} linhas gravadas")
+    print(f"tempo total {elapsed:.2f}s, {expected / elapsed:.0f} partidas/s, "
+          f"pior processo {max(per_writer) * 1000 / args.rows:.2f} ms/partida")
+    if count != expected:
+        print("ERRO: linhas perdidas!")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
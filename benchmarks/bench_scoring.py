@@ -0,0 +1,63 @@
+"""Benchmark da pontuação em lote (src/scoring.py) contra o Place.get_score.
+
+    python -m benchmarks.bench_scoring --guesses 5000000 --check 100000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.place import Place
+from src.scoring import score, score_chunked
+
+
+def fake_batch(n, seed=0):
+    """Palpites e locais na escala das anotações (mapa de 1080 de largura)."""
+    rng = np.random.default_rng(seed)
+    places = np.column_stack((
+        rng.uniform(0, 1080, n),
+        rng.uniform(0, 2400, n),
+        rng.choice([0.0, 15.0, 40.0, 90.0], n),
+    ))
+    guesses = places[:, :2] + rng.normal(0, 300, (n, 2))
+    return guesses, places
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--guesses", type=int, default=5_000_000)
+    parser.add_argument("--check", type=int, default=100_000, help="quantos conferir com o Place.get_score")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    guesses, places = fake_batch(args.guesses)
+
+    start = time.perf_counter()
+    _, scores = score(guesses, places)
+    single = time.perf_counter() - start
+    print(f"score (uma chamada)         {single:8.3f} s  ({args.guesses / single / 1e6:.1f} M palpites/s)")
+
+    start = time.perf_counter()
+    _, chunked = score_chunked(guesses, places, chunk_size=args.chunk_size, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"score_chunked               {elapsed:8.3f} s  ({args.guesses / elapsed / 1e6:.1f} M palpites/s)")
+    assert np.array_equal(scores, chunked)
+
+    check = min(args.check, args.guesses)
+    start = time.perf_counter()
+    expected = [
+        Place(path="", name="", position=(x, y), radius=radius).get_score((gx, gy))
+        for (gx, gy), (x, y, radius) in zip(guesses[:check].tolist(), places[:check].tolist())
+    ]
+    elapsed = time.perf_counter() - start
+    print(f"Place.get_score (Python)    {elapsed:8.3f} s  para {check} ({check / elapsed / 1e6:.2f} M palpites/s)")
+
+    mismatches = int(np.count_nonzero(scores[:check] != np.array(expected)))
+    print(f"Diferenças em relação ao Place.get_score: {mismatches}")
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark do índice espacial (src/spatial.py) contra a busca linear.
+
+    python -m benchmarks.bench_spatial --places 10000 100000 --queries 2000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.catalog import PlaceCatalog
+from src.spatial import SpatialGrid
+
+
+def fake_catalog(n, seed=0):
+    """Locais na escala das anotações (mapa de 1080 de largura), com alguns repetidos."""
+    rng = np.random.default_rng(seed)
+    catalog = PlaceCatalog(image_dir="")
+    xs = rng.uniform(0, 1080, n)
+    ys = rng.uniform(0, 2400, n)
+    radii = rng.choice([15.0, 40.0, 90.0], n)
+    for i in range(n):
+        catalog.add(f"IMG_{i:06d}.jpg", float(xs[i]), float(ys[i]), float(radii[i]))
+    return catalog
+
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def linear_search(catalog, points, radius=40.0):
+    """Busca linear (NumPy): ((tempo, resultado) do mais perto, (tempo, resultado) da sobreposição).
+
+    As views sobre os arrays do catálogo só existem aqui dentro: enquanto elas
+    vivem, o buffer fica travado e o `catalog.add` não consegue crescer os arrays.
+    """
+    xs = np.frombuffer(catalog.xs, dtype=np.float64)
+    ys = np.frombuffer(catalog.ys, dtype=np.float64)
+    radii = np.frombuffer(catalog.radii, dtype=np.float64)
+
+    def nearest():
+        return [int(np.argmin((xs - x) ** 2 + (ys - y) ** 2)) for x, y in points]
+
+    def overlap():
+        return [np.flatnonzero((xs - x) ** 2 + (ys - y) ** 2 < (radii + radius) ** 2).tolist() for x, y in points]
+
+    return timed(nearest, 1), timed(overlap, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--places", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--cell-size", type=float, default=None, help="padrão: escolhido pela densidade")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    failures = 0
+    for n in args.places:
+        catalog = fake_catalog(n)
+        points = np.column_stack((rng.uniform(0, 1080, args.queries), rng.uniform(0, 2400, args.queries))).tolist()
+
+        build, grid = timed(lambda: SpatialGrid.from_catalog(catalog, args.cell_size), 1)
+        print(f"\n{n} locais — montar o índice: {build * 1e3:.1f} ms (célula de {grid.cell_size:.1f})")
+
+        def grid_nearest():
+            return [grid.nearest(x, y)[0][1] for x, y in points]
+
+        def grid_overlap():
+            return [sorted(grid.overlapping(x, y, 40.0)) for x, y in points]
+
+        linear_nearest, linear_overlap = linear_search(catalog, points)
+        for label, indexed, (linear_time, linear_result) in (
+            ("mais perto", grid_nearest, linear_nearest),
+            ("sobreposição", grid_overlap, linear_overlap),
+        ):
+            grid_time, grid_result = timed(indexed, 1)
+            mismatches = sum(a != b for a, b in zip(grid_result, linear_result))
+            failures += mismatches
+            print(f"  {label:13s} índice {grid_time / len(points) * 1e6:8.1f} µs/consulta   "
+                  f"linear (NumPy) {linear_time / len(points) * 1e6:8.1f} µs/consulta   "
+                  f"x{linear_time / grid_time:5.1f}   diferenças: {mismatches}")
+
+        k_time, _ = timed(lambda: [grid.nearest(x, y, k=10) for x, y in points], 1)
+        print(f"  10 mais perto  índice {k_time / len(points) * 1e6:8.1f} µs/consulta")
+
+        catalog.spatial_index()
+        new_points = rng.uniform(0, 1080, (args.queries, 2)).tolist()
+        start = time.perf_counter()
+        for i, (x, y) in enumerate(new_points):
+            catalog.add(f"NEW_{i:06d}.jpg", x, y, 40.0)
+        add_time = time.perf_counter() - start
+        print(f"  inserção       {add_time / len(new_points) * 1e6:8.1f} µs/local (catálogo + índice)")
+        # Índice vivo do catálogo (com as inserções), não o `grid` montado antes delas
+        print(f"  duplicados     {len(catalog.spatial_index().duplicates())} grupo(s)")
+
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import argparse
+import time
+
+from src.annotation_journal import read_annotations
+from src.renditions import CACHE_DIR, GUESSING_DIR, RENDITION_WIDTHS, build_renditions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera versões reduzidas das fotos do jogo.")
+    parser.add_argument("--yaml", default="assets/main/img_description.yml")
+    parser.add_argument("--source", default=GUESSING_DIR)
+    parser.add_argument("--cache", default=CACHE_DIR)
+    parser.add_argument("--widths", type=int, nargs="+", default=list(RENDITION_WIDTHS))
+    parser.add_argument("--workers", type=int, default=None, help="Processos (padrão: um por núcleo)")
+    parser.add_argument("--force", action="store_true", help="Refaz tudo, mesmo sem mudanças")
+    args = parser.parse_args()
+
+    names = list(read_annotations(args.yaml).keys())
+
+    start = time.time()
+    rebuilt = build_renditions(names, args.source, args.cache, args.widths, args.workers, args.force)
+    print(f"{rebuilt} de {len(names)} imagens geradas em {time.time() - start:.1f}s ({args.cache})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,73 +1,86 @@
-import pygame
 import sys
-import os
-import random
-import yaml
-import pandas as pd
-import time
-
-from src.place import Place
-
-pygame.init()
-
-
-def crop_center(surface, target_ratio=16 / 9):
-    """Corta o centro da imagem para manter a proporção desejada (ex: 16:9)."""
-    w, h = surface.get_size()
-    current_ratio = w / h
-
-    if current_ratio > target_ratio:
-        new_w = int(h * target_ratio)
-        x = (w - new_w) // 2
-        rect = pygame.Rect(x, 0, new_w, h)
-    else:
-        new_h = int(w / target_ratio)
-        y = (h - new_h) // 2
-        rect = pygame.Rect(0, y, w, new_h)
-
-    cropped = surface.subsurface(rect)
-    return cropped.copy()
-
-
-def draw_scene(screen, active_image, minimap_image, is_map_image, WIN_WIDTH, WIN_HEIGHT, camera_y):
-    """Desenha a imagem principal, o mini mapa e retorna dados do mini mapa."""
-    img_width, img_height = active_image.get_size()
-    scale_factor = WIN_WIDTH / img_width
-    scaled_height = int(img_height * scale_factor)
-    active_scaled = pygame.transform.smoothscale(active_image, (WIN_WIDTH, scaled_height))
 
-    camera_y = max(0, min(scaled_height - WIN_HEIGHT, camera_y))
+from src import startup
 
-    screen.blit(active_scaled, (0, -camera_y))
+# Precisa vir antes dos outros imports para conseguir medi-los
+startup.begin(sys.argv)
 
-    mini_width = int(WIN_WIDTH * 0.25)
-    mini_scale_factor = mini_width / minimap_image.get_width()
-    mini_height = int(minimap_image.get_height() * mini_scale_factor)
+import math
+import pygame
+import os
+import time
 
-    if is_map_image:
-        minimap_image = crop_center(minimap_image, 16 / 9)
-        mini_scale_factor = mini_width / minimap_image.get_width()
-        mini_height = int(minimap_image.get_height() * mini_scale_factor)
+from src.place import ANNOTATION_WIDTH, annotation_to_image, circle_cache, image_to_annotation
+from src.catalog import load_catalog
+from src.score_store import CSV_PATH, DB_PATH, ScoreStore, ScoreWriter
+from src.leaderboard import Leaderboard
+from src.prefetch import IMAGE_READY, ImagePrefetcher
+from src.dirty import DirtyTracker
+from src.minimap import Minimap
+from src.viewport import Viewport
+from src.surface_budget import PRIORITY_VISIBLE, surface_budget
+from src.text_cache import get_font, render_text, reset_fonts, text_cache
+from src.profiler import profiler
+from src.input_source import inputs
+from src.render_backend import display
+from src.memory_telemetry import memory
+from src.kiosk import SessionTimeout, kiosk
+
+# Imagem principal em tiles (com zoom); os tiles ficam em cache entre um frame e outro
+viewport = Viewport()
+minimap = Minimap()
+
+# Tiles cedem memória antes do mini mapa; o piso evita refazer a tela inteira a cada frame
+surface_budget.register_cache("tiles", viewport.cache, priority=0, min_bytes=48 * 1024 * 1024)
+surface_budget.register_cache("minimap", minimap, priority=1, min_bytes=8 * 1024 * 1024)
+surface_budget.register_cache("circles", circle_cache, priority=0)
+surface_budget.register_cache("text", text_cache, priority=1)
+
+
+def init_pygame():
+    """Inicializa só os módulos do pygame que o jogo usa (sem áudio, joystick etc.)."""
+    pygame.display.init()
+    pygame.font.init()
+    # Fontes abertas antes de um pygame.quit() (partida anterior) não valem mais
+    reset_fonts()
+    startup.mark("pygame init")
+
+
+def draw_scene(screen, viewport, minimap_image, is_map_image, WIN_WIDTH, WIN_HEIGHT):
+    """Desenha a imagem principal (já posta no `viewport`), o mini mapa e retorna dados do mini mapa."""
+    with profiler.stage("tiles"):
+        display.draw_viewport(screen, viewport)
+
+    # O zoom do hover é atualizado em run() (minimap.update)
+    with profiler.stage("minimap"):
+        zoomed_x, zoomed_y, zoomed_width, zoomed_height = display.draw_minimap(
+            screen, minimap, minimap_image, is_map_image, WIN_WIDTH, WIN_HEIGHT
+        )
 
-    mini_x = WIN_WIDTH - mini_width - 10
-    mini_y = WIN_HEIGHT - mini_height - 10
-    mouse_x, mouse_y = pygame.mouse.get_pos()
-    hover = mini_x <= mouse_x <= mini_x + mini_width and mini_y <= mouse_y <= mini_y + mini_height
+    return zoomed_x, zoomed_y, zoomed_width, zoomed_height
 
-    zoom = 1.1 if hover else 1.0
-    zoomed_width = int(mini_width * zoom)
-    zoomed_height = int(mini_height * zoom)
-    zoomed_image = pygame.transform.smoothscale(minimap_image, (zoomed_width, zoomed_height))
 
-    zoomed_x = WIN_WIDTH - zoomed_width - 10
-    zoomed_y = WIN_HEIGHT - zoomed_height - 10
+def is_inside(rect, x, y):
+    """Como Rect.collidepoint, mas incluindo as bordas (mesmo teste dos botões)."""
+    return rect.x <= x <= rect.x + rect.width and rect.y <= y <= rect.y + rect.height
 
-    screen.blit(zoomed_image, (zoomed_x, zoomed_y))
 
-    pygame.draw.rect(screen, (255, 255, 255),
-                     (zoomed_x - 2, zoomed_y - 2, zoomed_width + 4, zoomed_height + 4), 2)
+def nearest_landmark_text(catalog, guess, answer_name):
+    """Frase com o lugar (com nome no YAML) mais perto do palpite, na escala das anotações.
 
-    return zoomed_x, zoomed_y, zoomed_width, zoomed_height, scale_factor, scaled_height, camera_y
+    None se não houver lugar com nome por perto: nome de arquivo não é nome de lugar.
+    """
+    found = catalog.nearest_landmark(*guess)
+    if found is None:
+        return None
+    distance, index = found
+    if answer_name in catalog:
+        answer = catalog.index_of(answer_name)
+        # Empate (anotações no mesmo ponto): vale o local certo, se ele tiver nome e posição de verdade
+        if (answer in catalog.labels and not catalog.is_placeholder(answer)
+                and math.hypot(catalog.xs[answer] - guess[0], catalog.ys[answer] - guess[1]) <= distance):
+            return f"Seu pin caiu mais perto de {catalog.labels[answer]}: o local certo!"
+    return f"Seu pin caiu mais perto de {catalog.labels[index]}"
 
 
 def draw_guess_and_next_buttons(screen, WIN_WIDTH, WIN_HEIGHT, font, spacing=20):
@@ -75,8 +88,8 @@ def draw_guess_and_next_buttons(screen, WIN_WIDTH, WIN_HEIGHT, font, spacing=20)
     Desenha os botões 'Adivinhar' e 'Próximo' lado a lado, centralizados horizontalmente.
     spacing: distância entre os botões
     """
-    text_guess = font.render("Adivinhar", True, (255, 255, 255))
-    text_next = font.render("Próximo", True, (255, 255, 255))
+    text_guess = render_text(font, "Adivinhar", (255, 255, 255))
+    text_next = render_text(font, "Próximo", (255, 255, 255))
     padding_x, padding_y = 30, 15
 
     width_guess = text_guess.get_width() + padding_x * 2
@@ -92,7 +105,7 @@ def draw_guess_and_next_buttons(screen, WIN_WIDTH, WIN_HEIGHT, font, spacing=20)
     start_x = WIN_WIDTH // 2 - total_width // 2
     y = WIN_HEIGHT - button_height - 30
 
-    mouse_x, mouse_y = pygame.mouse.get_pos()
+    mouse_x, mouse_y = inputs.mouse_pos()
     hover_guess = start_x <= mouse_x <= start_x + width_guess and y <= mouse_y <= y + button_height
     color_guess = (60, 140, 255) if hover_guess else (40, 100, 200)
     pygame.draw.rect(screen, color_guess, (start_x, y, width_guess, button_height), border_radius=10)
@@ -111,10 +124,11 @@ def draw_guess_and_next_buttons(screen, WIN_WIDTH, WIN_HEIGHT, font, spacing=20)
     return rect_guess, rect_next
 
 
-def run(screen, main_original, map_original, pin_image, font, clock, choosen_image):
+def run(screen, main_original, map_original, pin_image, font, clock, choosen_image, on_image_ready=None):
+    """Joga uma rodada. Se `main_original` for um placeholder, `on_image_ready`
+    devolve a imagem decodificada (ou None) quando chega o evento IMAGE_READY."""
     WIN_WIDTH, WIN_HEIGHT = screen.get_size()
     showing_main = True
-    camera_y = 0
     scroll_speed = 20
     pin_position = None
     show_guess_button = False
@@ -122,37 +136,89 @@ def run(screen, main_original, map_original, pin_image, font, clock, choosen_ima
     next_button_rect = None
     show_next_button = True
     score = 0.0
+    nearest_text = None  # Local mais perto do pin, mostrado depois do "Adivinhar"
 
     end = False
 
     mini_x, mini_y, mini_width, mini_height = 0, 0, 0, 0 # Valores iniciais seguros
     # ---------------------------------
 
+    dirty = DirtyTracker()
+    drawn_buttons = None  # Retângulos dos botões no último desenho
+
+    viewport.set_image(main_original, (WIN_WIDTH, WIN_HEIGHT))
+
+    def place_to_screen(point):
+        # As anotações do local estão na escala do mark_images: passa pelos pixels do mapa
+        return viewport.image_to_screen(annotation_to_image(point, map_original.get_width()))
+
+    def place_scale():
+        return viewport.scale * map_original.get_width() / ANNOTATION_WIDTH
+
     running = True
     while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        profiler.begin_frame()
+        with profiler.stage("events"):
+            events = inputs.events()
+        if kiosk.expired(events):
+            # Quiosque: o visitante foi embora no meio da partida
+            profiler.record_screen("rodada", dirty)
+            raise SessionTimeout
+
+        for event in events:
+            if profiler.handle_event(event):
+                dirty.mark_all()
+
+            elif event.type == pygame.QUIT:
                 running = False
 
             elif event.type == pygame.VIDEORESIZE:
                 WIN_WIDTH, WIN_HEIGHT = event.w, event.h
-                screen = pygame.display.set_mode((WIN_WIDTH, WIN_HEIGHT), pygame.RESIZABLE)
+                screen = display.resize((WIN_WIDTH, WIN_HEIGHT))
+                choosen_image.set_screen(screen)
+                viewport.cache.invalidate()
+                minimap.invalidate()
+                drawn_buttons = None
+                dirty.mark_all()
+
+            elif event.type == IMAGE_READY and on_image_ready:
+                ready_image = on_image_ready()
+                if ready_image:
+                    # Troca o placeholder pela foto já decodificada
+                    viewport.cache.invalidate(main_original)
+                    main_original = ready_image
+                    on_image_ready = None
+                    dirty.mark_all()
+
+            elif event.type == pygame.MOUSEWHEEL and event.y:
+                # Roda do mouse: zoom em volta do cursor
+                viewport.zoom_at(1 if event.y > 0 else -1, inputs.mouse_pos())
+
+            elif event.type == pygame.MOUSEMOTION and event.buttons[2]:
+                # Arrastar com o botão direito move a imagem
+                viewport.pan(-event.rel[0], -event.rel[1])
 
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                mouse_x, mouse_y = pygame.mouse.get_pos()
+                mouse_x, mouse_y = inputs.mouse_pos()
 
                 # Se clicar no mini mapa → troca as imagens
                 if mini_x <= mouse_x <= mini_x + mini_width and mini_y <= mouse_y <= mini_y + mini_height and not end:
+                    # A imagem que sai da tela principal não precisa mais dos tiles
+                    viewport.cache.invalidate(main_original if showing_main else map_original)
                     showing_main = not showing_main
-                    camera_y = 0
+                    viewport.set_image(main_original if showing_main else map_original, (WIN_WIDTH, WIN_HEIGHT))
                     pin_position = None
                     show_guess_button = False
 
                 # Se clicar no botão “Adivinhar”
                 elif show_guess_button and guess_button_rect and guess_button_rect.collidepoint(mouse_x, mouse_y):
-                    score = choosen_image.get_score((pin_position['x'], pin_position['y']))
-                    choosen_image.draw_line(camera_y=camera_y)
-                    choosen_image.draw_circle(camera_y=camera_y)
+                    # O pin está em pixels do mapa; as anotações, na escala do mark_images
+                    guess = image_to_annotation((pin_position['x'], pin_position['y']), map_original.get_width())
+                    score = choosen_image.get_score(guess)
+                    nearest_text = nearest_landmark_text(load_catalog(YAML_PATH), guess, choosen_image.name)
+                    with profiler.stage("overlay"):
+                        choosen_image.draw_line(to_screen=place_to_screen)
+                        choosen_image.draw_circle(to_screen=place_to_screen, scale=place_scale())
                     
                     
                     show_guess_button = False
@@ -160,22 +226,33 @@ def run(screen, main_original, map_original, pin_image, font, clock, choosen_ima
                     end = True
                     
                 elif show_next_button and next_button_rect and next_button_rect.collidepoint(mouse_x, mouse_y) and end:
+                    profiler.record_screen("rodada", dirty)
                     return score
 
                 elif not end:
+                    # Guarda o pin em pixels da imagem original (vale para qualquer zoom)
+                    pin_x, pin_y = viewport.screen_to_image((mouse_x, mouse_y))
                     pin_position = {
-                        "x": mouse_x,
-                        "y": mouse_y + camera_y,
+                        "x": pin_x,
+                        "y": pin_y,
                         "context": "main" if showing_main else "map",
                     }
                     show_guess_button = True
 
-        # Movimento do mouse para rolar a imagem
-        mouse_y = pygame.mouse.get_pos()[1]
+        # Mouse na borda da janela rola a imagem
+        mouse_x, mouse_y = inputs.mouse_pos()
+        camera = viewport.state
         if mouse_y < WIN_HEIGHT * 0.025:
-            camera_y -= scroll_speed
+            viewport.pan(0, -scroll_speed)
         elif mouse_y > WIN_HEIGHT * 0.975:
-            camera_y += scroll_speed
+            viewport.pan(0, scroll_speed)
+        if mouse_x < WIN_WIDTH * 0.015:
+            viewport.pan(-scroll_speed, 0)
+        elif mouse_x > WIN_WIDTH * 0.985:
+            viewport.pan(scroll_speed, 0)
+        if viewport.state != camera:
+            # Rolando pela borda: precisa dos próximos quadros mesmo sem eventos
+            inputs.keep_awake()
 
         # Seleciona imagens ativas
         if showing_main:
@@ -187,79 +264,95 @@ def run(screen, main_original, map_original, pin_image, font, clock, choosen_ima
             mini_img = main_original
             mini_is_map = False
 
-        mini_x, mini_y, mini_width, mini_height, scale_factor, scaled_height, camera_y = draw_scene(
-            screen, active_img, mini_img, mini_is_map, WIN_WIDTH, WIN_HEIGHT, camera_y
-        )
+        viewport.set_image(active_img, (WIN_WIDTH, WIN_HEIGHT))
 
-        # 🧷 Desenha o pin se existir
-        if pin_position and pin_position["context"] == "map":
-            draw_x = pin_position["x"] - 25
-            draw_y = pin_position["y"] - camera_y - 50
-            scaled_pin = pygame.transform.scale(pin_image, (50, 50))
-            screen.blit(scaled_pin, (draw_x, draw_y))
+        # --- Regiões que mudaram desde o último frame ---
+        show_pin = pin_position is not None and pin_position["context"] == "map"
+        pin_key = (pin_position["x"], pin_position["y"]) if show_pin else None
+        dirty.track("scene", (showing_main, viewport.state, end, pin_key), screen.get_rect())
 
-            # Desenha o círculo e a linha apenas se estivermos vendo o mapa
-            if not showing_main:
-                choosen_image.draw_line(camera_y=camera_y, font=font)
+        mini_rect = minimap.rect(mini_img, mini_is_map, WIN_WIDTH, WIN_HEIGHT)
+        if minimap.update(is_inside(mini_rect, mouse_x, mouse_y)):
+            inputs.keep_awake()
+        dirty.track("minimap", minimap.zoom, minimap.area(mini_img, mini_is_map, WIN_WIDTH, WIN_HEIGHT))
 
-            guess_button_rect, next_button_rect = draw_guess_and_next_buttons(screen, WIN_WIDTH, WIN_HEIGHT, font)
-            
-        pygame.display.flip()
-        clock.tick(30)
+        if show_pin and drawn_buttons:
+            buttons_state = tuple(is_inside(rect, mouse_x, mouse_y) for rect in drawn_buttons)
+            dirty.track("buttons", buttons_state, drawn_buttons[0].union(drawn_buttons[1]))
+        elif show_pin:
+            # Ainda não sabemos onde os botões ficam: redesenha tudo
+            dirty.mark_all()
+        else:
+            dirty.forget("buttons")
 
-    pygame.quit()
-    sys.exit()
+        if profiler.hud_visible:
+            dirty.mark(profiler.hud_rect())
 
+        if not display.begin(screen, dirty):
+            # Nada mudou: não desenha nem atualiza a tela
+            profiler.end_frame()
+            inputs.tick(clock, 30)
+            continue
 
-def get_yaml_data(yaml_path):
-    with open(yaml_path, 'r') as file:
-        data = yaml.safe_load(file)
-    return data
+        mini_x, mini_y, mini_width, mini_height = draw_scene(
+            screen, viewport, mini_img, mini_is_map, WIN_WIDTH, WIN_HEIGHT
+        )
 
+        # 🧷 Desenha o pin se existir
+        if show_pin:
+            pin_x, pin_y = viewport.image_to_screen((pin_position["x"], pin_position["y"]))
+            draw_x = pin_x - 25
+            draw_y = pin_y - 50
+            with profiler.stage("overlay"):
+                display.draw_sprite(screen, pin_image, (draw_x, draw_y, 50, 50))
+
+                # Desenha o círculo e a linha apenas se estivermos vendo o mapa
+                if not showing_main:
+                    choosen_image.draw_line(font=font, to_screen=place_to_screen)
+
+                if nearest_text:
+                    draw_text_with_border(screen, nearest_text, font, (255, 255, 255), (0, 0, 0),
+                                          WIN_WIDTH // 2, 30, 2)
+
+            with profiler.stage("buttons"):
+                guess_button_rect, next_button_rect = draw_guess_and_next_buttons(screen, WIN_WIDTH, WIN_HEIGHT, font)
+            drawn_buttons = (guess_button_rect, next_button_rect)
+
+        profiler.draw_hud(screen)
+        with profiler.stage("present"):
+            display.present(screen, dirty)
+        surface_budget.enforce()
+        profiler.end_frame()
+        inputs.tick(clock, 30)
 
-def choose_image(yaml_path, done_images):
-    image_data = get_yaml_data(yaml_path)
-    images = [img for img in os.listdir("assets/guessing") if img not in done_images and img in image_data.keys()]
-    
-    if images:
-        chosen_image = random.choice(images)
-        image_data = image_data[chosen_image]
-        
-        if image_data:
-            return Place(
-                    path=os.path.join("assets", "guessing", chosen_image), 
-                    position=(image_data['x'], image_data['y']), 
-                    radius=image_data['radius'], 
-                    name=chosen_image
-                )
-    print(f"Nenhuma imagem válida encontrada. Verifique o arquivo YAML.")
-    return None
+    pygame.quit()
+    sys.exit()
+
+
+def plan_rounds(yaml_path, rounds, window_width=None, seed=None):
+    """Sorteia de uma vez as imagens de todas as rodadas da sessão."""
+    session = load_catalog(yaml_path).session(seed=seed)
+    places = []
+    for _ in range(rounds):
+        place = session.draw(window_width)
+        if not place:
+            print("Nenhuma imagem válida encontrada. Verifique o arquivo YAML.")
+            break
+        places.append(place)
+    return places
   
 
 def draw_title(screen, text, font, text_color, border_color, x, y, border_thickness):
-    text_surface = font.render(text, True, text_color)
+    text_surface = render_text(font, text, text_color)
     text_rect = text_surface.get_rect(center=(x, y))
     screen.blit(text_surface, text_rect)
 
 
 def draw_text_with_border(screen, text, font, text_color, border_color, x, y, border_thickness):
     """Desenha texto com uma borda simples."""
-    text_surface = font.render(text, True, text_color)
-    border_surface = font.render(text, True, border_color)
-    
+    # Texto e borda (8 direções) já vêm compostos numa única superfície do cache
+    text_surface = render_text(font, text, text_color, True, border_color, border_thickness)
     text_rect = text_surface.get_rect(center=(x, y))
-
-    # Desenha a borda em 8 direções
-    screen.blit(border_surface, text_rect.move(-border_thickness, -border_thickness))
-    screen.blit(border_surface, text_rect.move(0, -border_thickness))
-    screen.blit(border_surface, text_rect.move(border_thickness, -border_thickness))
-    screen.blit(border_surface, text_rect.move(-border_thickness, 0))
-    screen.blit(border_surface, text_rect.move(border_thickness, 0))
-    screen.blit(border_surface, text_rect.move(-border_thickness, border_thickness))
-    screen.blit(border_surface, text_rect.move(0, border_thickness))
-    screen.blit(border_surface, text_rect.move(border_thickness, border_thickness))
-
-    # Desenha o texto principal por cima
     screen.blit(text_surface, text_rect)
 
 def get_score_message(score):
@@ -279,56 +372,107 @@ def get_score_message(score):
     else: # Para pontuações fora do esperado (e.g., > 500 ou negativas)
         return ["Pontuação final registrada!"]
 
-def score_message_screen(screen, font, clock, background_image_path, user_name, score):
-    """Exibe a pontuação final e a mensagem baseada no score do jogador."""
+def score_message_screen(screen, font, clock, background_image_path, user_name, score, leaderboard=None,
+                         background=None):
+    """Exibe a pontuação final, a mensagem baseada no score e o ranking (se houver).
+
+    `background` é o fundo já carregado (modo quiosque); sem ele, lê `background_image_path`.
+    No quiosque o botão volta para a tela inicial em vez de fechar o jogo.
+    """
     WIN_WIDTH, WIN_HEIGHT = screen.get_size()
     
     # Carrega e escala o fundo
     try:
-        background = pygame.image.load(background_image_path).convert()
+        if background is None:
+            background = pygame.image.load(background_image_path).convert()
         background = pygame.transform.smoothscale(background, (WIN_WIDTH, WIN_HEIGHT))
     except pygame.error:
         # Fallback para cor sólida se a imagem falhar
         background = pygame.Surface((WIN_WIDTH, WIN_HEIGHT))
         background.fill((10, 20, 40))
 
-    title_font = pygame.font.SysFont("Arial", 54, bold=True)
-    message_font = pygame.font.SysFont("Arial", 36, bold=False)
+    title_font = get_font("Arial", 54, bold=True)
+    message_font = get_font("Arial", 36, bold=False)
+    ranking_font = get_font("Arial", 28, bold=False)
 
     # Obtém as mensagens baseadas no score
     messages = get_score_message(score)
 
-    running = True
-    while running:
-        mouse_x, mouse_y = pygame.mouse.get_pos()
-
-        # Botão Fechar
-        button_text = font.render("Fechar Jogo", True, (255, 255, 255))
+    # O ranking não muda enquanto a tela está aberta: consulta uma vez só
+    ranking_lines = []
+    if leaderboard is not None:
+        player = user_name.lower()
+        rank = leaderboard.rank(player)
+        if rank is not None:
+            ranking_lines.append(
+                f"Seu recorde: {int(leaderboard.best_of(player))} pontos "
+                f"({rank}º de {leaderboard.players} jogadores)"
+            )
+        for position, (name, points, _) in enumerate(leaderboard.top(5), start=1):
+            ranking_lines.append(f"{position}. {name.title()} - {int(points)} pontos")
+
+    # Botão Fechar (só muda de lugar quando a janela muda de tamanho)
+    button_text = render_text(font, "Nova Partida" if kiosk.enabled else "Fechar Jogo", (255, 255, 255))
+
+    def button_layout(WIN_WIDTH, WIN_HEIGHT):
         padding_x, padding_y = 30, 15
         button_width = button_text.get_width() + padding_x * 2
         button_height = button_text.get_height() + padding_y * 2
         button_x = WIN_WIDTH // 2 - button_width // 2
         button_y = WIN_HEIGHT - button_height - 30
-        button_rect = pygame.Rect(button_x, button_y, button_width, button_height)
+        return pygame.Rect(button_x, button_y, button_width, button_height)
+
+    button_rect = button_layout(WIN_WIDTH, WIN_HEIGHT)
+
+    dirty = DirtyTracker()
+
+    running = True
+    while running:
+        profiler.begin_frame()
 
         # --- Loop de Eventos ---
-        for event in pygame.event.get():
+        with profiler.stage("events"):
+            events = inputs.events()
+        if kiosk.expired(events):
+            running = False
+
+        for event in events:
+            if profiler.handle_event(event):
+                dirty.mark_all()
+                continue
+
             if event.type == pygame.QUIT:
+                if kiosk.enabled:
+                    # No quiosque o botão só volta ao início: fechar a janela encerra o jogo
+                    pygame.quit()
+                    sys.exit()
                 running = False
             
             if event.type == pygame.VIDEORESIZE:
                 WIN_WIDTH, WIN_HEIGHT = event.w, event.h
-                screen = pygame.display.set_mode((WIN_WIDTH, WIN_HEIGHT), pygame.RESIZABLE)
+                screen = display.resize((WIN_WIDTH, WIN_HEIGHT))
                 try:
                     background = pygame.transform.smoothscale(background.copy(), (WIN_WIDTH, WIN_HEIGHT))
                 except:
                     background = pygame.Surface((WIN_WIDTH, WIN_HEIGHT))
                     background.fill((10, 20, 40))
+                button_rect = button_layout(WIN_WIDTH, WIN_HEIGHT)
+                dirty.mark_all()
 
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if button_rect.collidepoint(event.pos):
                     running = False # Sai do loop, encerrando o jogo
 
+        # Só o botão muda de aparência (hover); o resto é estático
+        mouse_x, mouse_y = inputs.mouse_pos()
+        dirty.track("button", button_rect.collidepoint(mouse_x, mouse_y), button_rect)
+        if profiler.hud_visible:
+            dirty.mark(profiler.hud_rect())
+        if not display.begin(screen, dirty):
+            profiler.end_frame()
+            inputs.tick(clock, 30)
+            continue
+
         screen.blit(background, (0, 0))
         
         # Painel de fundo para o texto
@@ -358,15 +502,22 @@ def score_message_screen(screen, font, clock, background_image_path, user_name,
         # y_pos += 50
         
         points_text = f"Sua Pontuação Total: {int(score)} pontos"
-        points_surface = message_font.render(points_text, True, (255, 215, 0))
+        points_surface = render_text(message_font, points_text, (255, 215, 0))
         screen.blit(points_surface, (WIN_WIDTH // 2 - points_surface.get_width() // 2, y_pos))
         y_pos += 80
 
         # Mensagens (Frases)
         for msg in messages:
-            msg_surface = title_font.render(msg, True, (0, 255, 0)) # Frases em verde
+            msg_surface = render_text(title_font, msg, (0, 255, 0)) # Frases em verde
             screen.blit(msg_surface, (WIN_WIDTH // 2 - msg_surface.get_width() // 2, y_pos))
             y_pos += 60 # Espaçamento entre as linhas de texto
+
+        # Ranking
+        y_pos += 10
+        for line in ranking_lines:
+            line_surface = render_text(ranking_font, line, (255, 255, 255))
+            screen.blit(line_surface, (WIN_WIDTH // 2 - line_surface.get_width() // 2, y_pos))
+            y_pos += 34
             
         # Botão Fechar
         hover = button_rect.collidepoint(mouse_x, mouse_y)
@@ -379,59 +530,83 @@ def score_message_screen(screen, font, clock, background_image_path, user_name,
         text_y_pos = button_rect.y + (button_rect.height - button_text.get_height()) // 2
         screen.blit(button_text, (text_x_pos, text_y_pos))
 
-        pygame.display.flip()
-        clock.tick(30)
+        profiler.draw_hud(screen)
+        with profiler.stage("present"):
+            display.present(screen, dirty)
+        profiler.end_frame()
+        inputs.tick(clock, 30)
+
+    profiler.record_screen("pontuação", dirty)
 
-def start_screen(screen, WIN_WIDTH, WIN_HEIGHT, font, background_image_path):
-    """Mostra a tela inicial com uma imagem de fundo e botão 'Começar'."""
+def start_screen(screen, WIN_WIDTH, WIN_HEIGHT, font, background_image_path, on_shown=None, background=None):
+    """Mostra a tela inicial com uma imagem de fundo e botão 'Começar'.
+
+    `on_shown` é chamado uma vez, logo depois do primeiro frame aparecer.
+    `background` é o fundo já carregado (modo quiosque); sem ele, lê `background_image_path`.
+    """
     
-    title_font = pygame.font.SysFont("Arial", 64, bold=True)
-    input_font = pygame.font.SysFont("Arial", 32)
+    title_font = get_font("Arial", 64, bold=True)
+    input_font = get_font("Arial", 32)
     clock = pygame.time.Clock()
 
     user_name = ""
     active_input = False
     
     # --- MUDANÇA 1: Carrega a imagem ORIGINAL ---
-    background_original = pygame.image.load(background_image_path).convert()
+    background_original = background or pygame.image.load(background_image_path).convert()
     # --- MUDANÇA 2: Cria a primeira versão escalada ---
     background_scaled = pygame.transform.smoothscale(background_original, (WIN_WIDTH, WIN_HEIGHT))
 
     # --- MUDANÇA 3: Remove o cálculo do 'input_rect' daqui ---
     # input_rect = pygame.Rect(WIN_WIDTH//2 - 200, WIN_HEIGHT//2 - 30, 400, 50)
-    
-    running = True
-    while running:
-        
-        mouse_x, mouse_y = pygame.mouse.get_pos()
-        
-        # --- MUDANÇA 4: Recalcula o 'input_rect' DENTRO do loop ---
+
+    # Caixa de texto e botão só mudam de lugar quando a janela muda de tamanho
+    button_text = render_text(font, "Começar", (255, 255, 255))
+
+    def layout(WIN_WIDTH, WIN_HEIGHT):
         input_rect = pygame.Rect(WIN_WIDTH//2 - 200, WIN_HEIGHT//2 - 30, 400, 50)
-        
-        # O cálculo do botão já estava dentro do loop, o que é ótimo
-        button_text = font.render("Começar", True, (255, 255, 255))
         padding_x, padding_y = 30, 15
         button_width = button_text.get_width() + padding_x * 2
         button_height = button_text.get_height() + padding_y * 2
         button_x = WIN_WIDTH // 2 - button_width // 2
         button_y = WIN_HEIGHT // 2 + 50
-        button_rect = pygame.Rect(button_x, button_y, button_width, button_height)
-        
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        return input_rect, pygame.Rect(button_x, button_y, button_width, button_height)
+
+    input_rect, button_rect = layout(WIN_WIDTH, WIN_HEIGHT)
+
+    dirty = DirtyTracker()
+    
+    running = True
+    while running:
+        profiler.begin_frame()
+        with profiler.stage("events"):
+            events = inputs.events()
+        if kiosk.expired(events):
+            # Quiosque: nome pela metade de quem desistiu não fica para o próximo
+            user_name = ""
+            active_input = False
+
+        for event in events:
+            if profiler.handle_event(event):
+                dirty.mark_all()
+
+            elif event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
 
             # --- MUDANÇA 5: Adiciona o handler para VIDEORESIZE ---
             elif event.type == pygame.VIDEORESIZE:
                 WIN_WIDTH, WIN_HEIGHT = event.w, event.h
-                screen = pygame.display.set_mode((WIN_WIDTH, WIN_HEIGHT), pygame.RESIZABLE)
+                screen = display.resize((WIN_WIDTH, WIN_HEIGHT))
                 # Re-escala a imagem de fundo original para o novo tamanho
                 background_scaled = pygame.transform.smoothscale(background_original, (WIN_WIDTH, WIN_HEIGHT))
+                input_rect, button_rect = layout(WIN_WIDTH, WIN_HEIGHT)
+                dirty.mark_all()
             # --- Fim da MUDANÇA 5 ---
 
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if button_rect.collidepoint(event.pos) and user_name.strip() != "":
+                    profiler.record_screen("tela inicial", dirty)
                     return user_name
 
                 if input_rect.collidepoint(event.pos):
@@ -445,14 +620,26 @@ def start_screen(screen, WIN_WIDTH, WIN_HEIGHT, font, background_image_path):
 
                 elif event.key == pygame.K_RETURN:
                     if user_name.strip() != "":
+                        profiler.record_screen("tela inicial", dirty)
                         return user_name
 
                 elif event.unicode.isprintable(): 
                     # Verifica se o novo texto caberá
-                    current_width = input_font.render(user_name, True, (0,0,0)).get_width()
+                    current_width = input_font.size(user_name)[0]
                     if current_width < input_rect.width - 20: # -20 de padding
                         user_name += event.unicode
 
+        # Só a caixa de texto e o botão mudam entre um frame e outro
+        mouse_x, mouse_y = inputs.mouse_pos()
+        dirty.track("input", (user_name, active_input), input_rect)
+        dirty.track("button", button_rect.collidepoint(mouse_x, mouse_y), button_rect)
+        if profiler.hud_visible:
+            dirty.mark(profiler.hud_rect())
+        if not display.begin(screen, dirty):
+            profiler.end_frame()
+            inputs.tick(clock, 30)
+            continue
+
         # --- MUDANÇA 6: Desenha a imagem 'background_scaled' ---
         screen.blit(background_scaled, (0, 0))
         
@@ -478,10 +665,10 @@ def start_screen(screen, WIN_WIDTH, WIN_HEIGHT, font, background_image_path):
         text_y_pos = input_rect.y + (input_rect.height - input_font.get_height()) // 2
 
         if user_name == "":
-            placeholder_surf = input_font.render("Nome Completo", True, (150, 150, 150))
+            placeholder_surf = render_text(input_font, "Nome Completo", (150, 150, 150))
             screen.blit(placeholder_surf, (input_rect.x + 10, text_y_pos))
         else:
-            input_surface = input_font.render(user_name, True, (255, 255, 255))
+            input_surface = render_text(input_font, user_name, (255, 255, 255))
             screen.blit(input_surface, (input_rect.x + 10, text_y_pos))
 
         # --- DESENHO DO BOTÃO ---
@@ -495,75 +682,194 @@ def start_screen(screen, WIN_WIDTH, WIN_HEIGHT, font, background_image_path):
         text_y_pos = button_rect.y + (button_rect.height - button_text.get_height()) // 2
         screen.blit(button_text, (text_x_pos, text_y_pos))
         
-        pygame.display.flip()
-        clock.tick(30)        
+        profiler.draw_hud(screen)
+        with profiler.stage("present"):
+            display.present(screen, dirty)
+        profiler.end_frame()
+        startup.first_frame()
+        if on_shown:
+            on_shown()
+            on_shown = None
+        inputs.tick(clock, 30)        
   
               
-def main():
-    WIN_WIDTH, WIN_HEIGHT = 1080, 720
-    screen = pygame.display.set_mode((WIN_WIDTH, WIN_HEIGHT), pygame.RESIZABLE)
-    pygame.display.set_caption("UDESC vista de cima")
-    font = pygame.font.SysFont("Arial", 32, bold=True)
-    background_image_path = os.path.join("assets", "main", "main.png")
-    
-    clock = pygame.time.Clock() 
-
-    user_name = start_screen(screen, WIN_WIDTH, WIN_HEIGHT, font, background_image_path)
-    user_score = 0
-    
-    done_images = []
-    
-    try:
-        df = pd.read_csv(os.path.join("assets", "scores.csv"))
-    except (FileNotFoundError, pd.errors.EmptyDataError): # Adicionado EmptyDataError
-        df = pd.DataFrame(columns=["name", "points", "time", "date"])
-        
-    
-    time_start = time.time()
-    for i in range(3): 
+MAP_PATH = "assets/main/imagem_final.png"
+YAML_PATH = "assets/main/img_description.yml"
+PIN_PATH = "assets/main/pin.png"
+BACKGROUND_PATH = os.path.join("assets", "main", "main.png")
+ROUNDS = 3
 
-        MAP_PATH = "assets/main/imagem_final.png"
-        YAML_PATH = "assets/main/img_description.yml"
-        PIN_PATH = "assets/main/pin.png"
-        
-        choosen_image = choose_image(YAML_PATH, done_images)
 
-        if not choosen_image:
-            print("Não há mais imagens para jogar.")
-            break # Sai do loop se não houver mais imagens
+class Game:
+    """Janela e o que não muda entre partidas: fontes, fundo, mapa, pin, ranking e gravação das pontuações.
 
-        done_images.append(choosen_image.name)
-
-        main_original = pygame.image.load(choosen_image.path).convert()
-        map_original = pygame.image.load(MAP_PATH).convert()
-        pin_image = pygame.image.load(PIN_PATH).convert_alpha()
-
-        # font = pygame.font.SysFont("Arial", 32, bold=True) # Já definido
-        # clock = pygame.time.Clock() # Já definido
+    O `main()` joga uma partida e fecha; o modo quiosque (`--kiosk`) usa o mesmo
+    `Game` em todas as partidas, sem recarregar nada.
+    """
 
-        choosen_image.set_screen(screen)
-        choosen_image.draw_circle()
+    def __init__(self, db_path=DB_PATH, csv_path=CSV_PATH):
+        profiler.configure(sys.argv)
+        surface_budget.configure(sys.argv)
+        display.configure(sys.argv)
+        memory.configure(sys.argv)
+        init_pygame()
+        self.screen = display.open((1080, 720), "UDESC vista de cima")
+        if not inputs.replaying:
+            inputs.configure(sys.argv)
+        startup.mark("janela criada")
+        self.font = get_font("Arial", 32, bold=True)
+        self.clock = pygame.time.Clock()
+        # Fundo, mapa e pin entram no orçamento como originais que nunca são liberadas
+        self.background = surface_budget.load(BACKGROUND_PATH, PRIORITY_VISIBLE)
+        self.db_path = db_path
+        self.csv_path = csv_path
+        # Carregados depois da tela inicial da primeira partida (não atrasam o primeiro frame)
+        self.leaderboard = None
+        self.score_writer = None
+        self.map_image = None
+        self.pin_image = None
+
+    def _load_shared(self):
+        # Pontuações vão para o SQLite (assets/scores.db) numa thread separada.
+        # O ranking lê o histórico uma vez e depois é atualizado a cada partida.
+        score_store = ScoreStore(self.db_path, self.csv_path)
+        self.leaderboard = Leaderboard.from_rows(score_store.rows())
+        score_store.close()
+        self.score_writer = ScoreWriter(self.db_path, self.csv_path)
+
+        # Mapa e pin são os mesmos em todas as rodadas (e partidas)
+        self.map_image = surface_budget.load(MAP_PATH, PRIORITY_VISIBLE)
+        self.pin_image = surface_budget.load(PIN_PATH, PRIORITY_VISIBLE, alpha=True)
+
+    def play(self):
+        """Uma partida. Retorna a linha gravada no histórico, com o tempo de cada rodada.
+
+        No quiosque, levanta `SessionTimeout` se a partida for abandonada no meio.
+        """
+        screen, font, clock = self.screen, self.font, self.clock
+        WIN_WIDTH, WIN_HEIGHT = screen.get_size()
+
+        places, prefetcher = [], None
+
+        def prepare_rounds():
+            # Sorteia as rodadas assim que a tela inicial aparece (o YAML não atrasa o
+            # primeiro frame) e as fotos vão sendo decodificadas enquanto o jogador digita o nome
+            nonlocal places, prefetcher
+            places = plan_rounds(YAML_PATH, ROUNDS, screen.get_width(), seed=inputs.seed)
+            # O índice espacial (local mais perto do pin) fica pronto antes do primeiro palpite
+            load_catalog(YAML_PATH).spatial_index()
+            if len(places) < ROUNDS:
+                print("Não há mais imagens para jogar.")
+            prefetcher = ImagePrefetcher([place.path for place in places], target_width=screen.get_width())
+
+        user_name = start_screen(screen, WIN_WIDTH, WIN_HEIGHT, font, BACKGROUND_PATH,
+                                 on_shown=prepare_rounds, background=self.background.surface)
+        if prefetcher is None:
+            prepare_rounds()
+        if self.leaderboard is None:
+            self._load_shared()
+        user_score = 0
+
+        map_original = self.map_image.surface
+
+        transitions = []
+        round_times = []
+        time_start = time.time()
+        round_end = time.perf_counter()
+        try:
+            for i, choosen_image in enumerate(places):
+                main_original, ready = prefetcher.get(i, screen.get_size())
+                if not ready and inputs.replaying:
+                    # O mini mapa muda de tamanho com a foto: na reprodução espera a decodificação
+                    # para a tela ficar igual à da partida gravada
+                    main_original, ready = prefetcher.result(i), True
+                on_image_ready = None if ready else (
+                    lambda index=i: prefetcher.result(index) if prefetcher.is_ready(index) else None
+                )
+                transitions.append(time.perf_counter() - round_end)
+
+                choosen_image.set_screen(screen)
+                choosen_image.draw_circle()
+
+                round_start = time.perf_counter()
+                user_score += run(screen, main_original, map_original, self.pin_image.surface, font, clock,
+                                  choosen_image, on_image_ready)
+                round_end = time.perf_counter()
+                round_times.append(round_end - round_start)
+                prefetcher.finish(i)
+                memory.checkpoint("round", round=i)
+        finally:
+            # Partida terminada ou abandonada: as fotos dela não ficam para a próxima
+            prefetcher.close()
+            viewport.release()
+            # Os círculos são dos locais desta partida (e do zoom em que foram vistos)
+            circle_cache.invalidate()
+        for i, transition in enumerate(transitions):
+            wait = prefetcher.wait_time(i)
+            wait_text = f"{wait * 1000:.1f} ms" if wait else "0 ms (já decodificada)"
+            print(f"Rodada {i + 1}: transição {transition * 1000:.1f} ms, espera pela imagem {wait_text}")
         
+        end_time = time.time()
         
-        user_score += run(screen, main_original, map_original, pin_image, font, clock, choosen_image)
-    
-    end_time = time.time()
-    
-    new_row = {
-        "name": user_name.lower(),
-        "points": user_score,
-        "time": end_time - time_start,
-        "date": time.strftime("%Y-%m-%d %H:%M:%S") 
-    }
-
-    df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
+        new_row = {
+            "name": user_name.lower(),
+            "points": user_score,
+            "time": end_time - time_start,
+            "date": time.strftime("%Y-%m-%d %H:%M:%S") 
+        }
+
+        self.score_writer.submit(new_row)
+        self.leaderboard.record(new_row["name"], new_row["points"], new_row["date"])
         
-    df.to_csv(os.path.join("assets", "scores.csv"), index=False)
-    
-    score_message_screen(screen, font, clock, background_image_path, user_name, user_score)
-    
-    pygame.quit()
+        score_message_screen(screen, font, clock, BACKGROUND_PATH, user_name, user_score, self.leaderboard,
+                             background=self.background.surface)
+
+        inputs.stop_recording({"points": user_score})
+        memory.checkpoint("session", points=user_score)
+        return dict(new_row, rounds=round_times)
+
+    def close(self):
+        if self.score_writer is not None:
+            self.score_writer.close()
+        for image in (self.background, self.map_image, self.pin_image):
+            if image is not None:
+                surface_budget.discard(image)
+        display.close()
+        pygame.quit()
+
+
+def main(db_path=DB_PATH, csv_path=CSV_PATH):
+    """Uma partida completa. Retorna a linha gravada no histórico, com o tempo de cada rodada."""
+    game = Game(db_path, csv_path)
+    result = game.play()
+    game.close()
+    return result
+
+
+def kiosk_main(db_path=DB_PATH, csv_path=CSV_PATH, sessions=None):
+    """Modo quiosque: partidas seguidas no mesmo processo, até fecharem a janela (ou `sessions` partidas)."""
+    game = Game(db_path, csv_path)
+    kiosk.touch()
+    try:
+        while sessions is None or kiosk.sessions < sessions:
+            try:
+                game.play()
+            except SessionTimeout:
+                print("Partida abandonada: voltando para a tela inicial")
+                inputs.stop_recording()
+                memory.checkpoint("session", points=None)
+            kiosk.end_session()
+    except SystemExit:
+        # Fecharam a janela (o pygame já foi encerrado): só espera as pontuações na fila
+        if game.score_writer is not None:
+            game.score_writer.close()
+        raise
+    game.close()
 
 
 if __name__ == "__main__":
-    main()
+    kiosk.configure(sys.argv)
+    if kiosk.enabled:
+        kiosk_main()
+    else:
+        main()
@@ -1,33 +1,29 @@
+import atexit
 import pygame
 import sys
 import os
-import random
-import yaml
-import pandas as pd
 import time
 import math
 
-from src.place import Place
+from src.place import Place, is_placeholder
+from src.catalog import PlaceCatalog
+from src.annotation_journal import AnnotationJournal
+from src.renditions import pick_rendition
+from src.image_loader import load_path
+from src.minimap import Minimap
+from src.surface_cache import ScaledSurfaceCache
+from src.text_cache import get_font, render_text
+from src.profiler import profiler
+from src.input_source import inputs
+from src.thumbnails import THUMB_SIZE, load_thumbnails
 
-pygame.init()
+# Só os módulos usados pela ferramenta (sem áudio, joystick etc.)
+pygame.display.init()
+pygame.font.init()
 
-
-def crop_center(surface, target_ratio=16 / 9):
-    """Corta o centro da imagem para manter a proporção desejada (ex: 16:9)."""
-    w, h = surface.get_size()
-    current_ratio = w / h
-
-    if current_ratio > target_ratio:
-        new_w = int(h * target_ratio)
-        x = (w - new_w) // 2
-        rect = pygame.Rect(x, 0, new_w, h)
-    else:
-        new_h = int(w / target_ratio)
-        y = (h - new_h) // 2
-        rect = pygame.Rect(0, y, w, new_h)
-
-    cropped = surface.subsurface(rect)
-    return cropped.copy()
+# Guarda as versões redimensionadas das imagens entre um frame e outro
+scaled_cache = ScaledSurfaceCache()
+minimap = Minimap()
 
 
 def draw_scene(screen, active_image, minimap_image, is_map_image, WIN_WIDTH, WIN_HEIGHT, camera_y):
@@ -35,38 +31,23 @@ def draw_scene(screen, active_image, minimap_image, is_map_image, WIN_WIDTH, WIN
     img_width, img_height = active_image.get_size()
     scale_factor = WIN_WIDTH / img_width
     scaled_height = int(img_height * scale_factor)
-    active_scaled = pygame.transform.smoothscale(active_image, (WIN_WIDTH, scaled_height))
+    with profiler.stage("scale"):
+        active_scaled = scaled_cache.get(active_image, (WIN_WIDTH, scaled_height))
 
     camera_y = max(0, min(scaled_height - WIN_HEIGHT, camera_y))
 
-    screen.blit(active_scaled, (0, -camera_y))
-
-    mini_width = int(WIN_WIDTH * 0.25)
-    mini_scale_factor = mini_width / minimap_image.get_width()
-    mini_height = int(minimap_image.get_height() * mini_scale_factor)
+    with profiler.stage("blit"):
+        screen.blit(active_scaled, (0, -camera_y))
 
-    if is_map_image:
-        minimap_image = crop_center(minimap_image, 16 / 9)
-        mini_scale_factor = mini_width / minimap_image.get_width()
-        mini_height = int(minimap_image.get_height() * mini_scale_factor)
-
-    mini_x = WIN_WIDTH - mini_width - 10
-    mini_y = WIN_HEIGHT - mini_height - 10
     mouse_x, mouse_y = pygame.mouse.get_pos()
-    hover = mini_x <= mouse_x <= mini_x + mini_width and mini_y <= mouse_y <= mini_y + mini_height
-
-    zoom = 1.1 if hover else 1.0
-    zoomed_width = int(mini_width * zoom)
-    zoomed_height = int(mini_height * zoom)
-    zoomed_image = pygame.transform.smoothscale(minimap_image, (zoomed_width, zoomed_height))
-
-    zoomed_x = WIN_WIDTH - zoomed_width - 10
-    zoomed_y = WIN_HEIGHT - zoomed_height - 10
-
-    screen.blit(zoomed_image, (zoomed_x, zoomed_y))
+    mini_rect = minimap.rect(minimap_image, is_map_image, WIN_WIDTH, WIN_HEIGHT)
+    if minimap.update(mini_rect.x <= mouse_x <= mini_rect.right and mini_rect.y <= mouse_y <= mini_rect.bottom):
+        inputs.keep_awake()
 
-    pygame.draw.rect(screen, (255, 255, 255),
-                     (zoomed_x - 2, zoomed_y - 2, zoomed_width + 4, zoomed_height + 4), 2)
+    with profiler.stage("minimap"):
+        zoomed_x, zoomed_y, zoomed_width, zoomed_height = minimap.draw(
+            screen, minimap_image, is_map_image, WIN_WIDTH, WIN_HEIGHT
+        )
 
     return zoomed_x, zoomed_y, zoomed_width, zoomed_height, scale_factor, scaled_height, camera_y
 
@@ -76,8 +57,8 @@ def draw_redo_and_next_buttons(screen, WIN_WIDTH, WIN_HEIGHT, font, spacing=20):
     Desenha os botões 'Adivinhar' e 'Próximo' lado a lado, centralizados horizontalmente.
     spacing: distância entre os botões
     """
-    text_guess = font.render("Refazer", True, (255, 255, 255))
-    text_next = font.render("Próximo", True, (255, 255, 255))
+    text_guess = render_text(font, "Refazer", (255, 255, 255))
+    text_next = render_text(font, "Próximo", (255, 255, 255))
     padding_x, padding_y = 30, 15
 
     width_guess = text_guess.get_width() + padding_x * 2
@@ -140,10 +121,16 @@ def run(screen, main_original, map_original, font, clock, choosen_image):
     positions_done = 0
     
     while running:
+        profiler.begin_frame()
         mouse_x, mouse_y = pygame.mouse.get_pos()
         
-        
-        for event in pygame.event.get():
+        with profiler.stage("events"):
+            events = inputs.events()
+
+        for event in events:
+
+            if profiler.handle_event(event):
+                continue
 
             if event.type == pygame.QUIT:
                 running = False
@@ -151,6 +138,8 @@ def run(screen, main_original, map_original, font, clock, choosen_image):
             elif event.type == pygame.VIDEORESIZE:
                 WIN_WIDTH, WIN_HEIGHT = event.w, event.h
                 screen = pygame.display.set_mode((WIN_WIDTH, WIN_HEIGHT), pygame.RESIZABLE)
+                scaled_cache.invalidate()
+                minimap.invalidate()
 
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 # Pressionar primeira vez -> posicionar imagem
@@ -158,6 +147,8 @@ def run(screen, main_original, map_original, font, clock, choosen_image):
                 
                 # Se clicar no mini mapa → troca as imagens
                 if mini_x <= mouse_x <= mini_x + mini_width and mini_y <= mouse_y <= mini_y + mini_height and not end:
+                    # A imagem que sai da tela principal não precisa mais da versão grande
+                    scaled_cache.invalidate(main_original if showing_main else map_original)
                     showing_main = not showing_main
                     camera_y = 0
                     image_position = None
@@ -202,6 +193,7 @@ def run(screen, main_original, map_original, font, clock, choosen_image):
         
         # Movimento do mouse para rolar a imagem
         mouse_y = pygame.mouse.get_pos()[1]
+        previous_camera_y = camera_y
         if mouse_y < WIN_HEIGHT * 0.025:
             camera_y -= scroll_speed
         elif mouse_y > WIN_HEIGHT * 0.975:
@@ -220,6 +212,9 @@ def run(screen, main_original, map_original, font, clock, choosen_image):
         mini_x, mini_y, mini_width, mini_height, scale_factor, scaled_height, camera_y = draw_scene(
             screen, active_img, mini_img, mini_is_map, WIN_WIDTH, WIN_HEIGHT, camera_y
         )
+        if camera_y != previous_camera_y:
+            # Rolando pela borda: precisa dos próximos quadros mesmo sem eventos
+            inputs.keep_awake()
         
         if positions_done >= 1 and image_position:
             center_x_img = image_position[choosen_image]["x"]
@@ -234,71 +229,157 @@ def run(screen, main_original, map_original, font, clock, choosen_image):
                 center_x_img, center_y_img 
             ) if not image_position[choosen_image]["radius"] else image_position[choosen_image]["radius"]
             
-            pygame.draw.circle(
-                screen, 
-                (255, 0, 0),  
-                (int(center_x_img), int(center_y_screen)), 
-                int(radius),
-                2  
-            )
-
-        redo_button, next_button = draw_redo_and_next_buttons(screen, WIN_WIDTH, WIN_HEIGHT, font)
-            
-        pygame.display.flip()
-        clock.tick(60)
+            with profiler.stage("overlay"):
+                pygame.draw.circle(
+                    screen, 
+                    (255, 0, 0),  
+                    (int(center_x_img), int(center_y_screen)), 
+                    int(radius),
+                    2  
+                )
+
+        with profiler.stage("buttons"):
+            redo_button, next_button = draw_redo_and_next_buttons(screen, WIN_WIDTH, WIN_HEIGHT, font)
+
+        profiler.draw_hud(screen)
+        with profiler.stage("present"):
+            pygame.display.flip()
+        profiler.end_frame()
+        inputs.tick(clock, 60)
 
     pygame.quit()
     sys.exit()
 
 
-def set_yaml_data(yaml_path, yaml_data):
-    with open(yaml_path, 'w') as file:
-        yaml.dump(yaml_data, file)
-        
-        
-def get_yaml_data(yaml_path):
-    with open(yaml_path, 'r') as file:
-        data = yaml.safe_load(file)
-    return data
+def warn_overlaps(catalog, name, entry):
+    """Avisa se a anotação nova caiu em cima de locais já anotados."""
+    overlaps = catalog.overlapping(entry["x"], entry["y"], entry["radius"], exclude=name)
+    if overlaps:
+        print(f"⚠️ {name} sobrepõe {len(overlaps)} local(is) já anotado(s): {', '.join(sorted(overlaps))}")
+    return overlaps
 
 
-def choose_image(yaml_path, done_images):
-    img_path = os.path.join("assets", "guessing")
-    images = [img for img in os.listdir(img_path) if img not in done_images]
+def pending_images(yaml_data, img_path=os.path.join("assets", "guessing")):
+    """Fotos sem anotação ou só com a anotação padrão."""
+    return sorted(img for img in os.listdir(img_path)
+                  if not yaml_data.get(img)
+                  or is_placeholder(yaml_data[img].get("x"), yaml_data[img].get("y"), yaml_data[img].get("radius")))
+
+
+def pick_image(screen, clock, font, small_font, names, thumbnails, gap=16):
+    """Tela com a grade de miniaturas. Retorna a foto clicada (ou None ao fechar)."""
+    scroll = 0
+    thumb_width, thumb_height = THUMB_SIZE
+    cell_width, cell_height = thumb_width + gap, thumb_height + small_font.get_height() + gap
+    top = font.get_height() + 2 * gap
+
+    while True:
+        profiler.begin_frame()
+        screen = pygame.display.get_surface()
+        WIN_WIDTH, WIN_HEIGHT = screen.get_size()
+        columns = max(1, (WIN_WIDTH - gap) // cell_width)
+        left = (WIN_WIDTH - columns * cell_width + gap) // 2
+        rows = -(-len(names) // columns)
+        max_scroll = max(0, top + rows * cell_height - WIN_HEIGHT)
+        mouse_x, mouse_y = pygame.mouse.get_pos()
+
+        # Foto debaixo do mouse
+        hovered = None
+        column, row = (mouse_x - left) // cell_width, (mouse_y - top + scroll) // cell_height
+        if mouse_y >= top and 0 <= column < columns and row >= 0:
+            index = row * columns + column
+            if index < len(names):
+                hovered = names[index]
+
+        with profiler.stage("events"):
+            events = inputs.events()
+        for event in events:
+            if profiler.handle_event(event):
+                continue
+            if event.type == pygame.QUIT:
+                return None
+            elif event.type == pygame.VIDEORESIZE:
+                pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
+            elif event.type == pygame.MOUSEWHEEL:
+                scroll -= event.y * cell_height // 2
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and hovered:
+                return hovered
+        scroll = max(0, min(max_scroll, scroll))
+
+        screen.fill((20, 20, 30))
+        with profiler.stage("tiles"):
+            for index, name in enumerate(names):
+                row, column = divmod(index, columns)
+                x, y = left + column * cell_width, top + row * cell_height - scroll
+                if y + cell_height < top or y > WIN_HEIGHT:
+                    continue
+                thumb = thumbnails.get(name)
+                if thumb is not None:
+                    screen.blit(thumb, (x + (thumb_width - thumb.get_width()) // 2,
+                                        y + (thumb_height - thumb.get_height()) // 2))
+                if name == hovered:
+                    pygame.draw.rect(screen, (60, 140, 255), (x - 4, y - 4, thumb_width + 8, thumb_height + 8), 3)
+                label = render_text(small_font, name, (220, 220, 220))
+                screen.blit(label, (x + (thumb_width - label.get_width()) // 2, y + thumb_height + 4))
+
+        # Título por cima das miniaturas que passaram do topo
+        pygame.draw.rect(screen, (20, 20, 30), (0, 0, WIN_WIDTH, top))
+        title = render_text(font, f"Escolha uma foto ({len(names)} pendentes)", (255, 255, 255))
+        screen.blit(title, (WIN_WIDTH // 2 - title.get_width() // 2, gap))
+
+        profiler.draw_hud(screen)
+        with profiler.stage("present"):
+            pygame.display.flip()
+        profiler.end_frame()
+        inputs.tick(clock, 60)
+
 
-    chosen_image = random.choice(images)
-    
-    return chosen_image
-  
 def main():
+    profiler.configure(sys.argv)
     MAP_PATH = "assets/main/imagem_final.png"
     YAML_PATH = "assets/main/img_description.yml"
     WIN_WIDTH, WIN_HEIGHT = 1080, 720
-    yaml_data = get_yaml_data(YAML_PATH)
-    done_images = list(yaml_data.keys())
+    # Anotações vão para um journal; o YAML é reescrito só na compactação (e na saída)
+    journal = AnnotationJournal(YAML_PATH)
+    atexit.register(journal.close)
+    yaml_data = journal.data
+
+    # Índice dos locais já anotados, para achar anotações duplicadas/sobrepostas
+    catalog = PlaceCatalog.from_data(yaml_data, available=yaml_data.keys())
+    for group in catalog.spatial_index().duplicates():
+        print("⚠️ Anotações no mesmo ponto:", ", ".join(catalog.names[i] for i in group))
+
+    # Janela, fontes, relógio e mapa valem para a sessão inteira
+    screen = pygame.display.set_mode((WIN_WIDTH, WIN_HEIGHT), pygame.RESIZABLE)
+    pygame.display.set_caption("Gerando dados das imagens")
+    font = get_font("Arial", 32, bold=True)
+    small_font = get_font("Arial", 16)
+    clock = pygame.time.Clock()
+    map_original = pygame.image.load(MAP_PATH).convert()
+
+    names = pending_images(yaml_data)
+    thumbnails = load_thumbnails(names)
 
-    
     while True:
-        screen = pygame.display.set_mode((WIN_WIDTH, WIN_HEIGHT), pygame.RESIZABLE)
-        pygame.display.set_caption("Gerando dados das imagens")
-        
-        choosen_image = choose_image(YAML_PATH, done_images)
-
-        if not choosen_image:
+        if not names:
             print("Não há mais imagens para processar.")
             break
 
-        done_images.append(choosen_image)
+        choosen_image = pick_image(screen, clock, font, small_font, names, thumbnails)
+        if choosen_image is None:
+            break
 
-        main_original = pygame.image.load(os.path.join("assets", "guessing", choosen_image)).convert()
-        map_original = pygame.image.load(MAP_PATH).convert()
+        screen = pygame.display.get_surface()
+        main_original = load_path(pick_rendition(choosen_image, screen.get_width()), screen.get_width()).convert()
 
-        font = pygame.font.SysFont("Arial", 32, bold=True)
-        clock = pygame.time.Clock()
+        image_position = run(screen, main_original, map_original, font, clock, choosen_image)
+        for name, entry in image_position.items():
+            warn_overlaps(catalog, name, entry)
+            catalog.add(name, entry["x"], entry["y"], entry["radius"])
+            journal.append(name, entry)
+        names.remove(choosen_image)
+        screen = pygame.display.get_surface()
 
-        yaml_data.update(run(screen, main_original, map_original, font, clock, choosen_image))
-        set_yaml_data(YAML_PATH, yaml_data)
-        
     pygame.quit()
 
 
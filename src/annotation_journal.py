@@ -0,0 +1,126 @@
+"""Gravação das anotações com journal.
+
+Cada anotação nova vira uma linha JSON no fim de `<yaml>.journal`, com fsync,
+em vez de reescrever o YAML inteiro. De tempos em tempos (e na saída) o journal
+é compactado no YAML: o arquivo novo é escrito ao lado e trocado com
+`os.replace`, então um crash nunca deixa o YAML pela metade. Quem lê junta o
+YAML com o que ainda estiver no journal (`read_annotations`).
+"""
+import json
+import os
+
+JOURNAL_SUFFIX = ".journal"
+
+
+def journal_path(yaml_path):
+    return yaml_path + JOURNAL_SUFFIX
+
+
+def _fsync_dir(path):
+    """Garante que a troca de nome do arquivo chegou ao disco (onde o SO deixa)."""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def read_journal(path):
+    """Entradas do journal em ordem: [(nome, {"x", "y", "radius"})].
+
+    Uma última linha incompleta (crash no meio da escrita) é ignorada.
+    """
+    entries = []
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                entries.append((record.pop("name"), record))
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def read_annotations(yaml_path):
+    """O YAML compactado mais o que ainda estiver no journal."""
+    import yaml  # Só carrega o parser quando as anotações são lidas
+
+    try:
+        with open(yaml_path, "r") as file:
+            data = yaml.safe_load(file) or {}
+    except FileNotFoundError:
+        data = {}
+    for name, entry in read_journal(journal_path(yaml_path)):
+        data[name] = entry
+    return data
+
+
+def write_yaml_atomic(yaml_path, data):
+    """Escreve o YAML num arquivo temporário e troca de uma vez."""
+    import yaml
+
+    tmp_path = yaml_path + ".tmp"
+    with open(tmp_path, "w") as file:
+        yaml.dump(data, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, yaml_path)
+    _fsync_dir(yaml_path)
+
+
+class AnnotationJournal:
+    """Anotações do `mark_images`: leitura com replay do journal e escrita incremental."""
+
+    def __init__(self, yaml_path, compact_every=50):
+        self.yaml_path = yaml_path
+        self.path = journal_path(yaml_path)
+        self.compact_every = compact_every
+        self.data = read_annotations(yaml_path)
+        # Entradas que já estavam no journal (de uma execução que caiu) contam como pendentes
+        self.pending = len(read_journal(self.path))
+        self._file = None
+
+    def append(self, name, entry):
+        """Grava uma anotação no journal (com fsync) e atualiza `data`."""
+        entry = {"x": entry["x"], "y": entry["y"], "radius": entry["radius"]}
+        if self._file is None:
+            self._file = open(self.path, "a+", encoding="utf-8")
+            if self._file.tell():
+                # Fecha uma linha cortada por crash, senão a próxima entrada grudaria nela
+                self._file.seek(self._file.tell() - 1)
+                if self._file.read(1) != "\n":
+                    self._file.write("\n")
+        self._file.write(json.dumps(dict(entry, name=name)) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.data[name] = entry
+        self.pending += 1
+        if self.compact_every and self.pending >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """Passa o journal para o YAML e esvazia o journal."""
+        if not self.pending:
+            return
+        # Primeiro o YAML: se cair antes de esvaziar o journal, o replay só repete as mesmas entradas
+        write_yaml_atomic(self.yaml_path, self.data)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        os.remove(self.path)
+        _fsync_dir(self.path)
+        self.pending = 0
+
+    def close(self):
+        self.compact()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
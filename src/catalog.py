@@ -0,0 +1,187 @@
+import os
+import random
+from array import array
+
+from src.annotation_journal import read_annotations
+from src.place import Place, is_placeholder
+from src.renditions import GUESSING_DIR, pick_rendition
+from src.spatial import SpatialGrid
+
+# Catálogos já carregados: (yaml, pasta das fotos) -> PlaceCatalog
+_catalogs = {}
+
+
+class PlaceCatalog:
+    """Locais anotados, carregados e validados uma única vez.
+
+    Guarda os dados em colunas (nomes + arrays de x, y e raio) em vez de um
+    objeto por local; o `Place` só é criado quando o local é sorteado.
+    O campo opcional `name` do YAML é o nome do lugar para o jogador ("Biblioteca").
+    """
+
+    __slots__ = ("image_dir", "names", "xs", "ys", "radii", "labels", "skipped", "_index", "_spatial")
+
+    def __init__(self, image_dir=GUESSING_DIR):
+        self.image_dir = image_dir
+        self.names = []
+        self.xs = array("d")
+        self.ys = array("d")
+        self.radii = array("d")
+        self.labels = {}  # índice -> nome do lugar (só os que têm)
+        self.skipped = []  # Entradas do YAML sem foto ou sem anotação
+        self._index = {}
+        self._spatial = None
+
+    @classmethod
+    def from_data(cls, data, image_dir=GUESSING_DIR, available=None):
+        """Monta o catálogo a partir do dicionário do YAML, validando contra a pasta."""
+        catalog = cls(image_dir)
+        if available is None:
+            available = set(os.listdir(image_dir))
+
+        for name in sorted(data or {}):
+            entry = data[name]
+            if name not in available or not entry or not {"x", "y", "radius"} <= entry.keys():
+                catalog.skipped.append(name)
+                continue
+            catalog.add(name, entry["x"], entry["y"], entry["radius"], entry.get("name"))
+        return catalog
+
+    @classmethod
+    def load(cls, yaml_path, image_dir=GUESSING_DIR):
+        """Lê o YAML mais as anotações que ainda estão no journal."""
+        return cls.from_data(read_annotations(yaml_path), image_dir)
+
+    def add(self, name, x, y, radius, label=None):
+        """Adiciona (ou atualiza) um local. Retorna o índice."""
+        index = self._index.get(name)
+        if index is None:
+            index = len(self.names)
+            self._index[name] = index
+            self.names.append(name)
+            self.xs.append(x)
+            self.ys.append(y)
+            self.radii.append(radius)
+            if self._spatial is not None:
+                self._spatial.add(x, y, radius)
+        else:
+            self.xs[index], self.ys[index], self.radii[index] = x, y, radius
+            if self._spatial is not None:
+                self._spatial.move(index, x, y, radius)
+        if label:
+            self.labels[index] = label
+        else:
+            self.labels.pop(index, None)
+        return index
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def index_of(self, name):
+        return self._index[name]
+
+    def spatial_index(self):
+        """Índice espacial dos locais (montado na primeira chamada e mantido pelo `add`)."""
+        if self._spatial is None:
+            self._spatial = SpatialGrid.from_catalog(self)
+        return self._spatial
+
+    def nearest(self, x, y, k=1):
+        """Nomes dos `k` locais mais perto do ponto (na escala das anotações): [(distância, nome)]."""
+        return [(distance, self.names[i]) for distance, i in self.spatial_index().nearest(x, y, k)]
+
+    def is_placeholder(self, index):
+        return is_placeholder(self.xs[index], self.ys[index], self.radii[index])
+
+    def nearest_landmark(self, x, y, k=16):
+        """Local com nome mais perto do ponto: (distância, índice) ou None.
+
+        Anotações com a posição padrão (placeholder) não contam: o lugar delas é
+        inventado. Procura entre os `k` mais perto e dobra `k` até achar.
+        """
+        if not self.labels:
+            return None
+        while True:
+            nearest = self.spatial_index().nearest(x, y, k)
+            for distance, index in nearest:
+                if index in self.labels and not self.is_placeholder(index):
+                    return distance, index
+            if len(nearest) < k:
+                return None
+            k *= 2
+
+    def overlapping(self, x, y, radius, exclude=None):
+        """Nomes dos locais cujo círculo cruza o círculo dado (menos `exclude`)."""
+        skip = self._index.get(exclude)
+        return [self.names[i] for i in self.spatial_index().overlapping(x, y, radius, exclude=skip)]
+
+    def place(self, index, window_width=None):
+        """Cria o `Place` do local `index`, com a foto adequada à largura da janela."""
+        name = self.names[index]
+        return Place(
+            path=pick_rendition(name, window_width, self.image_dir),
+            position=(self.xs[index], self.ys[index]),
+            radius=self.radii[index],
+            name=name,
+        )
+
+    def session(self, seed=None, exclude=()):
+        return CatalogSession(self, seed, exclude)
+
+
+class CatalogSession:
+    """Sorteio sem reposição dentro de uma sessão de jogo.
+
+    Usa um Fisher-Yates preguiçoso: só as posições já trocadas ficam num
+    dicionário, então criar a sessão e sortear cada rodada custam O(1),
+    independente do tamanho do catálogo.
+    """
+
+    __slots__ = ("catalog", "rng", "excluded", "_swaps", "_drawn")
+
+    def __init__(self, catalog, seed=None, exclude=()):
+        self.catalog = catalog
+        self.rng = random.Random(seed)
+        self.excluded = set(exclude)  # Nomes que não podem sair nesta sessão
+        self._swaps = {}
+        self._drawn = 0
+
+    def _next_index(self):
+        n = len(self.catalog)
+        i = self._drawn
+        if i >= n:
+            return None
+        j = self.rng.randrange(i, n)
+        value = self._swaps.get(j, j)
+        self._swaps[j] = self._swaps.get(i, i)
+        self._swaps.pop(i, None)
+        self._drawn += 1
+        return value
+
+    def draw(self, window_width=None):
+        """Sorteia o próximo local ainda não usado (ou None se acabaram)."""
+        while True:
+            index = self._next_index()
+            if index is None:
+                return None
+            name = self.catalog.names[index]
+            if name not in self.excluded:
+                self.excluded.add(name)
+                return self.catalog.place(index, window_width)
+
+    @property
+    def remaining(self):
+        return len(self.catalog) - self._drawn
+
+
+def load_catalog(yaml_path, image_dir=GUESSING_DIR):
+    """Retorna o catálogo do YAML, lendo o arquivo só na primeira chamada."""
+    key = (yaml_path, image_dir)
+    catalog = _catalogs.get(key)
+    if catalog is None:
+        catalog = PlaceCatalog.load(yaml_path, image_dir)
+        _catalogs[key] = catalog
+    return catalog
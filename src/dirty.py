@@ -0,0 +1,101 @@
+import pygame
+
+
+class DirtyTracker:
+    """Acompanha as regiões da tela que mudaram para redesenhar só o necessário.
+
+    Cada elemento da tela é registrado com `track(nome, estado, área)`. Quando o
+    estado muda, a área antiga e a nova entram na lista de retângulos sujos.
+    Um frame sem mudanças não desenha nada e não chama `display.update`.
+    """
+
+    def __init__(self):
+        self._states = {}
+        self._areas = {}
+        self._rects = []
+        self._full = True
+        self.frames = 0
+        self.idle_frames = 0
+        self.total_dirty_area = 0
+        self.last_frame = {"rects": 0, "area": 0, "fraction": 1.0}
+
+    def mark_all(self):
+        """Força o redesenho da janela inteira no próximo frame."""
+        self._full = True
+
+    def mark(self, rect):
+        if rect is None:
+            self._full = True
+        elif rect.width > 0 and rect.height > 0:
+            self._rects.append(pygame.Rect(rect))
+
+    def track(self, name, state, area):
+        """Marca `area` (e a área anterior do elemento) se o estado mudou."""
+        area = pygame.Rect(area) if area is not None else None
+        if name in self._states and self._states[name] == state and self._areas[name] == area:
+            return
+
+        if name in self._areas:
+            self.mark(self._areas[name])
+        self.mark(area)
+        self._states[name] = state
+        self._areas[name] = area
+
+    def forget(self, name):
+        """Remove um elemento (ex.: ao trocar de tela), marcando sua área."""
+        if name in self._areas:
+            self.mark(self._areas.pop(name))
+            self._states.pop(name, None)
+
+    @property
+    def dirty(self):
+        return self._full or bool(self._rects)
+
+    def begin(self, screen):
+        """Prepara o desenho: limita o clip às regiões sujas. Retorna False se nada mudou."""
+        self.frames += 1
+        if not self.dirty:
+            self.idle_frames += 1
+            self.last_frame = {"rects": 0, "area": 0, "fraction": 0.0}
+            return False
+
+        screen_rect = screen.get_rect()
+        if self._full:
+            self._rects = [screen_rect]
+        else:
+            self._rects = [r.clip(screen_rect) for r in self._rects]
+            self._rects = [r for r in self._rects if r.width and r.height]
+            if self._rects:
+                screen.set_clip(self._rects[0].unionall(self._rects[1:]))
+        return True
+
+    def present(self, screen, update=True):
+        """Envia à tela apenas os retângulos sujos e zera o estado do frame.
+
+        Com `update=False` só fecha a contabilidade (quem apresenta é o backend).
+        """
+        screen.set_clip(None)
+        if self._rects and update:
+            pygame.display.update(self._rects)
+
+        area = sum(r.width * r.height for r in self._rects)
+        screen_area = max(1, screen.get_width() * screen.get_height())
+        self.total_dirty_area += area
+        self.last_frame = {
+            "rects": len(self._rects),
+            "area": area,
+            "fraction": min(1.0, area / screen_area),
+        }
+        self._rects = []
+        self._full = False
+
+    def stats(self):
+        """Estatísticas acumuladas e do último frame."""
+        drawn = self.frames - self.idle_frames
+        return {
+            "frames": self.frames,
+            "idle_frames": self.idle_frames,
+            "drawn_frames": drawn,
+            "avg_dirty_area": self.total_dirty_area / drawn if drawn else 0,
+            "last_frame": dict(self.last_frame),
+        }
@@ -0,0 +1,87 @@
+"""Leitura das fotos já na resolução que a janela precisa.
+
+Um JPEG de 4032x3024 decodificado inteiro para uma janela de 1080 px joga fora
+quase todos os pixels. O decodificador de JPEG consegue sair direto em 1/2,
+1/4 ou 1/8 da resolução (escala na DCT), bem mais rápido e com menos memória.
+O Pillow expõe isso com `Image.draft`; sem o Pillow instalado, ou para outros
+formatos, volta para o `pygame.image.load`.
+"""
+import io
+import struct
+
+import pygame
+
+DCT_SCALES = (8, 4, 2)
+
+# Marcadores SOF (início do quadro, com as dimensões); C4, C8 e CC não são SOF
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def jpeg_size(data):
+    """(largura, altura) lidas do cabeçalho do JPEG, sem decodificar. None se não for JPEG."""
+    if data[:2] != b"\xff\xd8":
+        return None
+    pos = 2
+    end = len(data)
+    while pos + 4 <= end:
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            pos += 1  # Bytes de preenchimento
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            pos += 2  # Marcadores sem tamanho
+            continue
+        (length,) = struct.unpack(">H", data[pos + 2:pos + 4])
+        if marker in _SOF_MARKERS:
+            if pos + 9 > end:
+                return None
+            height, width = struct.unpack(">HH", data[pos + 5:pos + 9])
+            return width, height
+        if marker == 0xDA:
+            return None  # Começou a imagem sem SOF: arquivo estranho
+        pos += 2 + length
+    return None
+
+
+def pick_scale(size, target_width):
+    """Maior redução da DCT (8, 4, 2) que ainda cobre `target_width`. 1 = sem redução."""
+    if not target_width:
+        return 1
+    for scale in DCT_SCALES:
+        if -(-size[0] // scale) >= target_width:
+            return scale
+    return 1
+
+
+def _decode_reduced(data, size, scale):
+    """Decodifica em 1/`scale` com o Pillow. None se o Pillow não estiver instalado."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+
+    image = Image.open(io.BytesIO(data))
+    image.draft("RGB", (-(-size[0] // scale), -(-size[1] // scale)))
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    # frombuffer usa os bytes do Pillow direto, sem mais uma cópia dos pixels
+    return pygame.image.frombuffer(image.tobytes(), image.size, "RGB")
+
+
+def load_surface(data, name="", target_width=None):
+    """Decodifica `data` (bytes do arquivo). Com `target_width`, JPEGs saem reduzidos pela DCT."""
+    size = jpeg_size(data) if target_width else None
+    if size:
+        scale = pick_scale(size, target_width)
+        if scale > 1:
+            surface = _decode_reduced(data, size, scale)
+            if surface is not None:
+                return surface
+    return pygame.image.load(io.BytesIO(data), name)
+
+
+def load_path(path, target_width=None):
+    with open(path, "rb") as file:
+        return load_surface(file.read(), path, target_width)
@@ -0,0 +1,254 @@
+"""Entrada do jogo (eventos, mouse e relógio) com gravação e reprodução.
+
+As telas leem eventos e a posição do mouse por aqui em vez de chamar o pygame
+direto. Assim uma partida pode ser gravada (`--record-input=arquivo`) e depois
+reproduzida sem janela, quadro a quadro, com o mesmo resultado.
+
+Também é quem dita o ritmo dos quadros: se a tela não pediu `keep_awake()` no
+quadro (rolagem pela borda, animação), o `tick()` dorme em `pygame.event.wait`
+até chegar um evento, em vez de redesenhar 30 vezes por segundo à toa.
+
+Formato do arquivo (JSON por linha, comprimido com gzip):
+    {"version": 1, "seed": ...}                         cabeçalho
+    [ms, [x, y], [[tipo, {atributos}], ...]]           quadro com eventos
+    [n]                                                 n quadros sem eventos, mouse parado
+    {"points": ...}                                     resultado (se a partida terminou)
+"""
+import atexit
+import gzip
+import json
+import random
+import time
+
+import pygame
+
+FORMAT_VERSION = 1
+
+# Só os eventos que as telas tratam; os do próprio jogo (IMAGE_READY etc.) não são gravados
+RECORDED_EVENTS = (
+    pygame.QUIT,
+    pygame.KEYDOWN,
+    pygame.KEYUP,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEBUTTONUP,
+    pygame.MOUSEMOTION,
+    pygame.MOUSEWHEEL,
+    pygame.VIDEORESIZE,
+)
+_TUPLE_ATTRS = ("pos", "rel", "buttons", "size")
+
+# Parado, acorda pelo menos uma vez a cada IDLE_TIMEOUT_MS mesmo sem eventos
+IDLE_TIMEOUT_MS = 500
+
+
+def _encode_event(event):
+    attrs = {key: value for key, value in event.dict.items() if key != "window"}
+    return [event.type, attrs]
+
+
+def _decode_event(data):
+    event_type, attrs = data
+    for key in _TUPLE_ATTRS:
+        if key in attrs:
+            attrs[key] = tuple(attrs[key])
+    return pygame.event.Event(event_type, attrs)
+
+
+def coalesce_motion(events):
+    """Junta MOUSEMOTIONs seguidos (com os mesmos botões) num só, somando o `rel`."""
+    merged = []
+    for event in events:
+        if (event.type == pygame.MOUSEMOTION and merged and merged[-1].type == pygame.MOUSEMOTION
+                and merged[-1].buttons == event.buttons):
+            rel = merged[-1].rel[0] + event.rel[0], merged[-1].rel[1] + event.rel[1]
+            merged[-1] = pygame.event.Event(pygame.MOUSEMOTION, dict(event.dict, rel=rel))
+        else:
+            merged.append(event)
+    return merged
+
+
+class InputRecorder:
+    """Grava os quadros de entrada num arquivo compacto."""
+
+    def __init__(self, path, seed):
+        self.path = path
+        self.seed = seed
+        self.frames = 0
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._start = time.perf_counter()
+        self._idle = 0
+        self._last_pos = None
+        self._write({"version": FORMAT_VERSION, "seed": seed})
+
+    def _write(self, item):
+        self._file.write(json.dumps(item, separators=(",", ":")) + "\n")
+
+    def frame(self, events, pos):
+        self.frames += 1
+        recorded = [_encode_event(e) for e in events if e.type in RECORDED_EVENTS]
+        if not recorded and pos == self._last_pos:
+            self._idle += 1
+            return
+        self._flush_idle()
+        self._last_pos = pos
+        elapsed_ms = round((time.perf_counter() - self._start) * 1000)
+        self._write([elapsed_ms, list(pos), recorded])
+
+    def _flush_idle(self):
+        if self._idle:
+            self._write([self._idle])
+            self._idle = 0
+
+    def close(self, result=None):
+        if self._file.closed:
+            return
+        self._flush_idle()
+        if result is not None:
+            self._write(result)
+        self._file.close()
+
+
+class Recording:
+    """Arquivo gravado pelo InputRecorder, já lido para a memória."""
+
+    def __init__(self, header, frames, result=None):
+        self.header = header
+        self.frames = frames  # [(ms, pos, [eventos]) ou (n,)]
+        self.result = result  # Resultado da partida original, para conferir a reprodução
+
+    @classmethod
+    def load(cls, path):
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            header = json.loads(file.readline())
+            if header.get("version") != FORMAT_VERSION:
+                raise ValueError(f"Versão de gravação não suportada: {header.get('version')}")
+            frames = [json.loads(line) for line in file if line.strip()]
+        result = frames.pop() if frames and isinstance(frames[-1], dict) else None
+        return cls(header, frames, result)
+
+    @property
+    def seed(self):
+        return self.header["seed"]
+
+    @property
+    def duration(self):
+        """Duração (s) da partida original."""
+        for frame in reversed(self.frames):
+            if len(frame) == 3:
+                return frame[0] / 1000
+        return 0.0
+
+    def __iter__(self):
+        """Quadro a quadro: (posição do mouse, [eventos])."""
+        pos = (0, 0)
+        for frame in self.frames:
+            if len(frame) == 1:
+                for _ in range(frame[0]):
+                    yield pos, []
+                continue
+            pos = tuple(frame[1])
+            yield pos, [_decode_event(data) for data in frame[2]]
+
+
+class InputSource:
+    """De onde as telas leem a entrada: o pygame (com ou sem gravação) ou uma gravação.
+
+    A posição do mouse é lida uma vez por quadro, em `events()`, para o quadro
+    inteiro ver a mesma posição (e a reprodução ser exata).
+    """
+
+    def __init__(self, idle_timeout_ms=IDLE_TIMEOUT_MS):
+        self.seed = None
+        self.realtime = True
+        self.recorder = None
+        self.exhausted = False
+        self.idle_timeout_ms = idle_timeout_ms
+        self.idle_waits = 0  # Quantas vezes o tick dormiu esperando evento
+        self._replay = None
+        self._pos = (0, 0)
+        self._awake = False
+        self._pending = []  # Evento que acordou o tick, entregue no próximo events()
+
+    def configure(self, argv):
+        """Liga a gravação com `--record-input=arquivo`."""
+        for arg in argv:
+            if arg.startswith("--record-input="):
+                self.record(arg.split("=", 1)[1])
+
+    def record(self, path, seed=None):
+        """Grava a próxima partida. A semente sorteia as rodadas (plan_rounds)."""
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.recorder = InputRecorder(path, self.seed)
+        # Fechar a janela no meio da partida sai com sys.exit: o arquivo fecha mesmo assim
+        atexit.register(self.stop_recording)
+
+    def replay(self, recording, realtime=False):
+        """Reproduz uma gravação; `realtime=False` não espera o relógio entre quadros."""
+        self.seed = recording.seed
+        self.realtime = realtime
+        self.exhausted = False
+        self._replay = iter(recording)
+        self._pos = (0, 0)
+
+    def live(self):
+        """Volta para a entrada normal do pygame."""
+        self.stop_recording()
+        self.seed = None
+        self.realtime = True
+        self._replay = None
+
+    @property
+    def replaying(self):
+        return self._replay is not None
+
+    def events(self):
+        if self._replay is None:
+            events = coalesce_motion(self._pending + pygame.event.get())
+            self._pending = []
+            self._pos = pygame.mouse.get_pos()
+            if self.recorder:
+                self.recorder.frame(events, self._pos)
+            return events
+
+        # Eventos do próprio jogo (IMAGE_READY etc.) continuam vindo da fila real
+        events = [e for e in pygame.event.get() if e.type >= pygame.USEREVENT]
+        frame = next(self._replay, None)
+        if frame is None:
+            # Gravação acabou antes da partida: encerra como se a janela fosse fechada
+            self.exhausted = True
+            return events + [pygame.event.Event(pygame.QUIT)]
+        self._pos, recorded = frame
+        return events + recorded
+
+    def mouse_pos(self):
+        return self._pos
+
+    def keep_awake(self):
+        """Pede o próximo quadro no ritmo normal (vale só para o quadro atual)."""
+        self._awake = True
+
+    def tick(self, clock, fps):
+        """Espera o próximo quadro (na reprodução rápida só conta o tempo).
+
+        Se ninguém chamou `keep_awake()` neste quadro, dorme até chegar um evento
+        (ou `idle_timeout_ms`). Com eventos chegando, `fps` continua sendo o limite.
+        """
+        awake, self._awake = self._awake, False
+        if not self.realtime:
+            return clock.tick()
+        if awake or self._replay is not None or self._pending or pygame.event.peek():
+            return clock.tick(fps)
+        self.idle_waits += 1
+        event = pygame.event.wait(self.idle_timeout_ms)
+        if event.type != pygame.NOEVENT:
+            self._pending.append(event)
+        return clock.tick()
+
+    def stop_recording(self, result=None):
+        if self.recorder:
+            self.recorder.close(result)
+            self.recorder = None
+
+
+# Entrada compartilhada por todas as telas
+inputs = InputSource()
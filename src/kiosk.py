@@ -0,0 +1,79 @@
+"""Modo quiosque (`--kiosk[=segundos]`): partidas seguidas no mesmo processo.
+
+Em vez de fechar depois da tela de pontuação, o jogo volta para a tela inicial
+com a janela, as fontes, o mapa, o pin, o catálogo e o ranking já carregados.
+Se ninguém mexer por `idle_seconds`, a partida em andamento é abandonada (sem
+pontuação) e a tela inicial volta limpa para o próximo visitante.
+"""
+import gc
+import time
+
+import pygame
+
+DEFAULT_IDLE_SECONDS = 90
+
+# Eventos que contam como alguém usando o jogo
+ACTIVITY_EVENTS = (
+    pygame.KEYDOWN,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEMOTION,
+    pygame.MOUSEWHEEL,
+    pygame.FINGERDOWN,
+)
+
+
+class SessionTimeout(Exception):
+    """Ninguém mexeu na partida por `idle_seconds`: volta para a tela inicial."""
+
+
+class Kiosk:
+    """Controle do modo quiosque: tempo sem uso e contagem de partidas."""
+
+    def __init__(self, idle_seconds=DEFAULT_IDLE_SECONDS):
+        self.enabled = False
+        self.idle_seconds = idle_seconds
+        self.sessions = 0
+        self.timeouts = 0
+        self._last_activity = time.monotonic()
+
+    def configure(self, argv):
+        """Liga com `--kiosk` ou `--kiosk=SEGUNDOS` (tempo sem uso até voltar ao início)."""
+        for arg in argv:
+            if arg == "--kiosk" or arg.startswith("--kiosk="):
+                self.enabled = True
+                seconds = arg.partition("=")[2]
+                if seconds:
+                    self.idle_seconds = float(seconds)
+
+    def touch(self):
+        self._last_activity = time.monotonic()
+
+    def expired(self, events):
+        """True se passou `idle_seconds` sem nenhum evento de uso (sempre False fora do quiosque).
+
+        Quando expira, o relógio recomeça: a próxima tela ganha o tempo inteiro.
+        """
+        if not self.enabled:
+            return False
+        if any(event.type in ACTIVITY_EVENTS for event in events):
+            self.touch()
+            return False
+        if time.monotonic() - self._last_activity < self.idle_seconds:
+            return False
+        self.timeouts += 1
+        self.touch()
+        return True
+
+    def end_session(self):
+        """Fim de uma partida (terminada ou abandonada).
+
+        O estado da partida já saiu dos caches; a coleta de ciclos roda aqui,
+        com a tela inicial parada, e não no meio da próxima rodada.
+        """
+        self.sessions += 1
+        self.touch()
+        gc.collect()
+
+
+# Modo quiosque compartilhado pelas telas (desligado até o configure)
+kiosk = Kiosk()
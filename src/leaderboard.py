@@ -0,0 +1,145 @@
+import bisect
+import heapq
+import time
+from array import array
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class _FenwickTree:
+    """Árvore de Fenwick sobre pontuações inteiras: conta quantos jogadores têm cada recorde."""
+
+    def __init__(self, size=1024):
+        self.size = size
+        self.tree = array("l", [0]) * (size + 1)
+
+    def _grow(self, index):
+        size = self.size
+        while index >= size:
+            size *= 2
+        counts = [self.prefix(i) - self.prefix(i - 1) for i in range(self.size)]
+        self.size = size
+        self.tree = array("l", [0]) * (size + 1)
+        for i, count in enumerate(counts):
+            if count:
+                self.add(i, count)
+
+    def add(self, index, delta):
+        if index >= self.size:
+            self._grow(index)
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, index):
+        """Soma das posições 0..index."""
+        total = 0
+        i = min(index, self.size - 1) + 1
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+
+class Leaderboard:
+    """Ranking atualizado a cada partida, sem reler o histórico.
+
+    - top-N geral num heap de tamanho N;
+    - recorde de cada jogador num dicionário;
+    - posição do jogador em O(log P) com uma árvore de Fenwick sobre os recordes;
+    - janelas de tempo (hoje / semana) por busca binária no índice de datas.
+    """
+
+    def __init__(self, top_n=10):
+        self.top_n = top_n
+        self.games = 0
+        self.best = {}
+        self._top = []  # heap mínimo de (pontos, sequência, nome, data)
+        self._ranks = _FenwickTree()
+        # Índice por data: datas em ordem e as partidas correspondentes
+        self._dates = []
+        self._points = array("d")
+        self._players = array("l")
+        self._names = []
+        self._name_ids = {}
+
+    @classmethod
+    def from_rows(cls, rows, top_n=10):
+        """Monta o ranking a partir de (nome, pontos, tempo, data), ex.: ScoreStore.rows()."""
+        leaderboard = cls(top_n)
+        for name, points, _, date in rows:
+            leaderboard.record(name, points, date)
+        return leaderboard
+
+    def record(self, name, points, date=None):
+        """Registra uma partida. Custo O(log n)."""
+        if date is None:
+            date = time.strftime(DATE_FORMAT)
+        self.games += 1
+
+        entry = (points, self.games, name, date)
+        if len(self._top) < self.top_n:
+            heapq.heappush(self._top, entry)
+        elif entry[0] > self._top[0][0]:
+            heapq.heapreplace(self._top, entry)
+
+        previous = self.best.get(name)
+        if previous is None or points > previous:
+            if previous is not None:
+                self._ranks.add(max(0, int(previous)), -1)
+            self._ranks.add(max(0, int(points)), 1)
+            self.best[name] = points
+
+        player = self._name_ids.get(name)
+        if player is None:
+            player = self._name_ids[name] = len(self._names)
+            self._names.append(name)
+
+        if not self._dates or date >= self._dates[-1]:
+            position = len(self._dates)
+        else:
+            # Partida fora de ordem (ex.: importada depois): mantém o índice ordenado
+            position = bisect.bisect_right(self._dates, date)
+        self._dates.insert(position, date)
+        self._points.insert(position, points)
+        self._players.insert(position, player)
+
+    def top(self, n=None):
+        """As `n` melhores partidas de todos os tempos: [(nome, pontos, data)]."""
+        n = self.top_n if n is None else min(n, self.top_n)
+        best = heapq.nlargest(n, self._top)
+        return [(name, points, date) for points, _, name, date in best]
+
+    def top_since(self, since, n=None):
+        """As `n` melhores partidas com data >= `since` (string no formato DATE_FORMAT)."""
+        n = self.top_n if n is None else n
+        start = bisect.bisect_left(self._dates, since)
+        indexes = heapq.nlargest(n, range(start, len(self._dates)), key=self._points.__getitem__)
+        return [(self._names[self._players[i]], self._points[i], self._dates[i]) for i in indexes]
+
+    def top_today(self, n=None, now=None):
+        now = time.localtime() if now is None else now
+        return self.top_since(time.strftime("%Y-%m-%d 00:00:00", now), n)
+
+    def top_this_week(self, n=None, now=None):
+        """Desde a segunda-feira da semana atual."""
+        now = time.time() if now is None else now
+        weekday = time.localtime(now).tm_wday
+        monday = time.localtime(now - weekday * 86400)
+        return self.top_since(time.strftime("%Y-%m-%d 00:00:00", monday), n)
+
+    def best_of(self, name):
+        return self.best.get(name)
+
+    def rank(self, name):
+        """Posição (1 = melhor) do recorde do jogador entre todos os jogadores, ou None."""
+        points = self.best.get(name)
+        if points is None:
+            return None
+        better = len(self.best) - self._ranks.prefix(max(0, int(points)))
+        return better + 1
+
+    @property
+    def players(self):
+        return len(self.best)
@@ -0,0 +1,174 @@
+"""Telemetria de memória entre rodadas e partidas.
+
+Ligada com `--memory-telemetry[=caminho]`. Em cada fim de rodada e de partida
+(`checkpoint`) registra o RSS do processo, a memória Python (tracemalloc) com
+as linhas que mais cresceram desde o ponto anterior, as superfícies do pygame
+vivas e o uso do `surface_budget`. No fim grava um JSON compacto (um ponto por
+linha, valores arredondados) que dá para comparar com `diff` entre versões, e
+avisa quando alguma métrica cresce de forma persistente.
+"""
+import atexit
+import gc
+import json
+import os
+import resource
+import time
+import tracemalloc
+
+DEFAULT_REPORT_PATH = "memory_profile.json"
+
+# Crescimento persistente: subiu em todos os últimos `GROWTH_POINTS` pontos e somou mais que o limite
+GROWTH_POINTS = 4
+GROWTH_LIMITS = {
+    "rss_mb": 16.0,
+    "python_mb": 4.0,
+    "surfaces": 8,
+    "surface_mb": 16.0,
+}
+
+MB = 1024 * 1024
+
+
+def current_rss():
+    """RSS atual em bytes (o ru_maxrss só dá o pico)."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def live_surfaces():
+    """(quantidade, bytes) das superfícies alcançáveis a partir de objetos do Python.
+
+    Superfícies não entram no coletor de ciclos: são achadas pelos objetos que
+    as referenciam (listas, dicionários, caches, variáveis dos frames...).
+    Subsuperfícies contam na quantidade, mas os pixels são da superfície pai.
+    """
+    import pygame
+
+    seen = {}
+    for obj in gc.get_objects():
+        for ref in gc.get_referents(obj):
+            if type(ref) is pygame.Surface:
+                seen[id(ref)] = ref
+    nbytes = 0
+    for surface in seen.values():
+        if surface.get_parent() is None:
+            nbytes += surface.get_width() * surface.get_height() * surface.get_bytesize()
+    return len(seen), nbytes
+
+
+def _short_path(filename):
+    """Caminho relativo ao projeto; de fora dele (bibliotecas), só pasta/arquivo."""
+    path = os.path.relpath(filename)
+    if path.startswith(".."):
+        path = os.path.join(*filename.split(os.sep)[-2:])
+    return path
+
+
+def persistent_growth(values, points=GROWTH_POINTS, limit=0.0):
+    """True se os últimos `points` valores nunca caíram e cresceram mais que `limit` no total."""
+    if len(values) < points:
+        return False
+    recent = values[-points:]
+    rising = all(b >= a for a, b in zip(recent, recent[1:]))
+    return rising and recent[-1] - recent[0] > limit
+
+
+class MemoryTelemetry:
+    """Pontos de medição de memória nas fronteiras de rodada e de partida."""
+
+    def __init__(self, top=10):
+        self.enabled = False
+        self.top = top
+        self.report_path = None
+        self.session = 0
+        self.checkpoints = []
+        self.warnings = []
+        self._snapshot = None
+        self._start = time.perf_counter()
+
+    def configure(self, argv):
+        """Liga com `--memory-telemetry[=caminho]` e grava o relatório ao sair."""
+        for arg in argv:
+            if arg == "--memory-telemetry" or arg.startswith("--memory-telemetry="):
+                self.enable(arg.partition("=")[2] or DEFAULT_REPORT_PATH)
+
+    def enable(self, report_path=None):
+        if not self.enabled:
+            self.enabled = True
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self._snapshot = tracemalloc.take_snapshot()
+            atexit.register(self.write)
+        if report_path:
+            self.report_path = report_path
+
+    def _top_growth(self):
+        """Linhas de código que mais alocaram desde o ponto anterior."""
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        stats = snapshot.compare_to(self._snapshot, "lineno") if self._snapshot else []
+        self._snapshot = snapshot
+        grown = sorted((stat for stat in stats if stat.size_diff > 0), key=lambda stat: -stat.size_diff)
+        return [[f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                 round(stat.size_diff / 1024, 1), stat.count_diff]
+                for stat in grown[:self.top]]
+
+    def checkpoint(self, kind, **extra):
+        """Mede agora. `kind` é "round" ou "session" (fim de partida)."""
+        if not self.enabled:
+            return None
+        from src.surface_budget import surface_budget
+
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        surfaces, surface_bytes = live_surfaces()
+        point = {
+            "kind": kind,
+            "session": self.session,
+            **extra,
+            "t": round(time.perf_counter() - self._start, 2),
+            "rss_mb": round(current_rss() / MB, 1),
+            "python_mb": round(current / MB, 2),
+            "python_peak_mb": round(peak / MB, 2),
+            "surfaces": surfaces,
+            "surface_mb": round(surface_bytes / MB, 1),
+            "budget_mb": {name: round(value / MB, 1) for name, value in surface_budget.usage().items()},
+            "top": self._top_growth(),
+        }
+        self.checkpoints.append(point)
+        if kind == "session":
+            self.session += 1
+        self._check_growth(kind)
+        return point
+
+    def _check_growth(self, kind):
+        points = [point for point in self.checkpoints if point["kind"] == kind]
+        for metric, limit in GROWTH_LIMITS.items():
+            values = [point[metric] for point in points]
+            if persistent_growth(values, limit=limit):
+                warning = (f"{metric} cresce a cada {'rodada' if kind == 'round' else 'partida'}: "
+                           f"{values[-GROWTH_POINTS]} -> {values[-1]}")
+                if warning not in self.warnings:
+                    self.warnings.append(warning)
+                    print("⚠️ Memória:", warning)
+
+    def write(self, path=None):
+        """Grava o relatório: um ponto por linha, para o diff entre versões ficar legível."""
+        path = path or self.report_path
+        if not path or not self.checkpoints:
+            return
+        with open(path, "w") as file:
+            file.write('{"warnings": ' + json.dumps(self.warnings, ensure_ascii=False) + ',\n "checkpoints": [\n')
+            file.write(",\n".join("  " + json.dumps(point, ensure_ascii=False) for point in self.checkpoints))
+            file.write("\n]}\n")
+        print(f"Telemetria de memória salva em {path}")
+
+
+# Telemetria compartilhada (desligada até o configure)
+memory = MemoryTelemetry()
@@ -0,0 +1,150 @@
+import weakref
+from collections import OrderedDict
+
+import pygame
+
+from src.surface_budget import surface_bytes
+
+
+def crop_center(surface, target_ratio=16 / 9):
+    """Corta o centro da imagem para manter a proporção desejada (ex: 16:9)."""
+    w, h = surface.get_size()
+    current_ratio = w / h
+
+    if current_ratio > target_ratio:
+        new_w = int(h * target_ratio)
+        x = (w - new_w) // 2
+        rect = pygame.Rect(x, 0, new_w, h)
+    else:
+        new_h = int(w / target_ratio)
+        y = (h - new_h) // 2
+        rect = pygame.Rect(0, y, w, new_h)
+
+    cropped = surface.subsurface(rect)
+    return cropped.copy()
+
+
+class Minimap:
+    """Mini mapa do canto inferior direito.
+
+    O recorte 16:9 e as versões com e sem zoom são calculados uma única vez por
+    (imagem, tamanho da janela). A animação de hover usa `transform.scale` sobre a
+    versão pequena já pronta, sem reamostrar a imagem original.
+    """
+
+    def __init__(self, width_ratio=0.25, margin=10, hover_zoom=1.1, zoom_step=0.025, max_entries=4):
+        self.width_ratio = width_ratio
+        self.margin = margin
+        self.hover_zoom = hover_zoom
+        self.zoom_step = zoom_step
+        self.max_entries = max_entries
+        self.zoom = 1.0
+        self._renditions = OrderedDict()
+
+    def size(self, image, is_map_image, WIN_WIDTH):
+        """Tamanho do mini mapa sem zoom (sem copiar a imagem)."""
+        w, h = image.get_size()
+        if is_map_image:
+            target_ratio = 16 / 9
+            if w / h > target_ratio:
+                w = int(h * target_ratio)
+            else:
+                h = int(w / target_ratio)
+
+        mini_width = int(WIN_WIDTH * self.width_ratio)
+        mini_height = int(h * (mini_width / w))
+        return mini_width, mini_height
+
+    def rect(self, image, is_map_image, WIN_WIDTH, WIN_HEIGHT):
+        """Retângulo do mini mapa sem zoom (área que reage ao mouse)."""
+        mini_width, mini_height = self.size(image, is_map_image, WIN_WIDTH)
+        return pygame.Rect(WIN_WIDTH - mini_width - self.margin, WIN_HEIGHT - mini_height - self.margin,
+                           mini_width, mini_height)
+
+    def area(self, image, is_map_image, WIN_WIDTH, WIN_HEIGHT):
+        """Área ocupada no zoom máximo, incluindo a borda."""
+        mini_width, mini_height = self.size(image, is_map_image, WIN_WIDTH)
+        zoomed_width = int(mini_width * self.hover_zoom)
+        zoomed_height = int(mini_height * self.hover_zoom)
+        return pygame.Rect(WIN_WIDTH - zoomed_width - self.margin - 2, WIN_HEIGHT - zoomed_height - self.margin - 2,
+                           zoomed_width + 4, zoomed_height + 4)
+
+    def source_rect(self, image, is_map_image):
+        """Parte da imagem que aparece no mini mapa (o recorte 16:9 do mapa)."""
+        if not is_map_image:
+            return image.get_rect()
+        w, h = image.get_size()
+        if w / h > 16 / 9:
+            new_w = int(h * 16 / 9)
+            return pygame.Rect((w - new_w) // 2, 0, new_w, h)
+        new_h = int(w / (16 / 9))
+        return pygame.Rect(0, (h - new_h) // 2, w, new_h)
+
+    def zoomed_rect(self, image, is_map_image, WIN_WIDTH, WIN_HEIGHT):
+        """Onde o mini mapa é desenhado no zoom atual."""
+        mini_width, mini_height = self.size(image, is_map_image, WIN_WIDTH)
+        zoomed_width = int(mini_width * self.zoom)
+        zoomed_height = int(mini_height * self.zoom)
+        return pygame.Rect(WIN_WIDTH - zoomed_width - self.margin, WIN_HEIGHT - zoomed_height - self.margin,
+                           zoomed_width, zoomed_height)
+
+    def update(self, hover):
+        """Avança a animação de hover. Retorna True enquanto ainda está animando."""
+        target = self.hover_zoom if hover else 1.0
+        if self.zoom < target:
+            self.zoom = min(target, self.zoom + self.zoom_step)
+        elif self.zoom > target:
+            self.zoom = max(target, self.zoom - self.zoom_step)
+        return self.zoom != target
+
+    def set_hover(self, hover):
+        """Vai direto para o zoom final, sem animação."""
+        self.zoom = self.hover_zoom if hover else 1.0
+
+    def _get_renditions(self, image, is_map_image, WIN_WIDTH, WIN_HEIGHT):
+        key = (id(image), is_map_image, (WIN_WIDTH, WIN_HEIGHT))
+        entry = self._renditions.get(key)
+        if entry is not None and entry[0]() is image:
+            self._renditions.move_to_end(key)
+            return entry[1]
+
+        source = image.subsurface(self.source_rect(image, is_map_image))
+        mini_width, mini_height = self.size(image, is_map_image, WIN_WIDTH)
+        renditions = {}
+        for zoom in (1.0, self.hover_zoom):
+            size = (int(mini_width * zoom), int(mini_height * zoom))
+            renditions[zoom] = pygame.transform.smoothscale(source, size)
+
+        self._renditions[key] = (weakref.ref(image), renditions)
+        while len(self._renditions) > self.max_entries:
+            self._renditions.popitem(last=False)
+        return renditions
+
+    def draw(self, screen, image, is_map_image, WIN_WIDTH, WIN_HEIGHT):
+        """Desenha o mini mapa no zoom atual e retorna (x, y, largura, altura)."""
+        renditions = self._get_renditions(image, is_map_image, WIN_WIDTH, WIN_HEIGHT)
+        zoomed_x, zoomed_y, zoomed_width, zoomed_height = self.zoomed_rect(image, is_map_image, WIN_WIDTH, WIN_HEIGHT)
+        zoomed_image = renditions.get(self.zoom)
+        if zoomed_image is None:
+            # Quadro intermediário da animação: escala rápida da versão com zoom
+            zoomed_image = pygame.transform.scale(renditions[self.hover_zoom], (zoomed_width, zoomed_height))
+
+        screen.blit(zoomed_image, (zoomed_x, zoomed_y))
+
+        pygame.draw.rect(screen, (255, 255, 255),
+                         (zoomed_x - 2, zoomed_y - 2, zoomed_width + 4, zoomed_height + 4), 2)
+
+        return zoomed_x, zoomed_y, zoomed_width, zoomed_height
+
+    def invalidate(self):
+        self._renditions.clear()
+
+    @property
+    def current_bytes(self):
+        return sum(surface_bytes(surface)
+                   for _, renditions in self._renditions.values() for surface in renditions.values())
+
+    def shrink(self, max_bytes):
+        """Descarta as versões menos usadas até ocupar no máximo `max_bytes`."""
+        while self._renditions and self.current_bytes > max_bytes:
+            self._renditions.popitem(last=False)
@@ -1,4 +1,97 @@
-import pygame
+# O pygame só é importado nas funções de desenho: a parte de pontuação
+# (get_score/get_distance) pode ser usada sem ele.
+import math
+from collections import OrderedDict
+
+# As posições do YAML foram marcadas no mark_images com o mapa ocupando a largura
+# da janela padrão: `position` e `radius` estão nessa escala, não em pixels do mapa
+ANNOTATION_WIDTH = 1080
+
+# Distância (na escala das anotações) a partir da qual o palpite vale 0 pontos.
+# src/scoring.py faz a mesma conta em lote com NumPy
+MAX_DISTANCE = 1_000
+
+# Anotação padrão de quem ainda não foi marcada de verdade (posição inventada)
+PLACEHOLDER = {"x": 600, "y": 300, "radius": 100}
+
+
+class CircleCache:
+    """Círculos já desenhados: (raio, cor, espessura) -> superfície do tamanho do círculo.
+
+    O raio acompanha o zoom, então cada local/nível de zoom/largura de janela é
+    uma entrada nova (a 6x, ~9 MB cada): LRU limitado por bytes, registrado no
+    `surface_budget` pelo main.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()  # chave -> (superfície, bytes)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, surface):
+        nbytes = surface.get_width() * surface.get_height() * surface.get_bytesize()
+        self._entries[key] = (surface, nbytes)
+        self.current_bytes += nbytes
+        # Mantém sempre o círculo mais recente, mesmo que sozinho passe do limite
+        while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+            self._remove(next(iter(self._entries)))
+
+    def shrink(self, max_bytes):
+        while self.current_bytes > max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def _remove(self, key):
+        _, nbytes = self._entries.pop(key)
+        self.current_bytes -= nbytes
+
+
+circle_cache = CircleCache()
+
+
+def is_placeholder(x, y, radius):
+    return (x, y, radius) == (PLACEHOLDER["x"], PLACEHOLDER["y"], PLACEHOLDER["radius"])
+
+
+def image_to_annotation(point, image_width):
+    """Pixel do mapa original -> escala das anotações (a usada em get_score)."""
+    factor = ANNOTATION_WIDTH / image_width
+    return point[0] * factor, point[1] * factor
+
+
+def annotation_to_image(point, image_width):
+    factor = image_width / ANNOTATION_WIDTH
+    return point[0] * factor, point[1] * factor
+
+
+def _circle_surface(radius, color, width):
+    """Superfície transparente só do tamanho do círculo (desenhada uma vez)."""
+    import pygame
+
+    key = (radius, tuple(color), width)
+    surface = circle_cache.get(key)
+    if surface is None:
+        size = 2 * radius + 2
+        center = (radius + 1, radius + 1)
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+
+        transparent_color = (*color, 100)
+        pygame.draw.circle(surface, transparent_color, center, radius)
+        pygame.draw.circle(surface, color, center, radius, width)
+
+        circle_cache.put(key, surface)
+    return surface
+
 
 class Place:
     def __init__(self, path, name, position, radius=0):
@@ -7,6 +100,8 @@ class Place:
         self.position = position 
         self.radius = radius
         self.guessed_position = None
+        self.score = None
+        self.score_text = None
         self.screen = None 
         
     def set_screen(self, screen):
@@ -16,63 +111,74 @@ class Place:
         self.guessed_position = guessed_position
         distance = self.get_distance()
 
-        max_distance = 1_000 
         if distance <= 0:
-            return 100
-        elif distance >= max_distance:
-            return 0
+            score = 100
+        elif distance >= MAX_DISTANCE:
+            score = 0
         else:
-            score = 100 * (1 - distance / max_distance)
-            return round(score)
+            score = round(100 * (1 - distance / MAX_DISTANCE))
+
+        # Guarda o texto da pontuação para draw_line não recalcular a cada frame
+        self.score = score
+        self.score_text = f"{score:.3f}"
+        return score
 
 
     def get_distance(self):
         """Calcula a distância entre o ponto real e o chute do jogador."""
-        distance = ((self.position[0] - self.guessed_position[0]) ** 2 +
-                    (self.position[1] - self.guessed_position[1]) ** 2) ** 0.5
+        # sqrt (e não ** 0.5) para dar o mesmo resultado, bit a bit, do np.sqrt
+        dx = self.position[0] - self.guessed_position[0]
+        dy = self.position[1] - self.guessed_position[1]
+        distance = math.sqrt(dx * dx + dy * dy)
         if distance < self.radius:
             return 0
         return distance - self.radius
 
-    def draw_circle(self, camera_y=0, color=(255, 0, 0), width=2):
-        """Desenha um círculo semi-transparente na posição do local real."""
-        circle_surface = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
-        x, y = self.position
-        y_on_screen = y - camera_y
-
-        transparent_color = (*color, 100)
+    def draw_circle(self, camera_y=0, color=(255, 0, 0), width=2, to_screen=None, scale=1.0):
+        """Desenha um círculo semi-transparente na posição do local real.
 
-        pygame.draw.circle(circle_surface, transparent_color,
-                           (int(x), int(y_on_screen)), int(self.radius))
+        `to_screen` converte um ponto das anotações para a tela (com zoom);
+        sem ele, só desconta `camera_y`. `scale` ajusta o raio ao zoom.
+        """
+        radius = int(self.radius * scale)
+        if radius <= 0:
+            return
 
-        pygame.draw.circle(circle_surface, color,
-                           (int(x), int(y_on_screen)), int(self.radius), width)
+        circle_surface = _circle_surface(radius, color, width)
+        if to_screen is None:
+            x, y_on_screen = self.position[0], self.position[1] - camera_y
+        else:
+            x, y_on_screen = to_screen(self.position)
 
-        self.screen.blit(circle_surface, (0, 0))
+        self.screen.blit(circle_surface, (int(x) - radius - 1, int(y_on_screen) - radius - 1))
 
-    def draw_line(self, camera_y=0, color=(0, 255, 0), width=3, font=None):
+    def draw_line(self, camera_y=0, color=(0, 255, 0), width=3, font=None, to_screen=None):
         """Desenha uma linha do local correto até o palpite e mostra a pontuação."""
         if self.guessed_position is None:
             return
 
-        x1, y1 = self.position
-        x2, y2 = self.guessed_position
+        import pygame
+        from src.text_cache import get_font, render_text
 
-        y1 -= camera_y
-        y2 -= camera_y
+        if to_screen is None:
+            x1, y1 = self.position[0], self.position[1] - camera_y
+            x2, y2 = self.guessed_position[0], self.guessed_position[1] - camera_y
+        else:
+            x1, y1 = to_screen(self.position)
+            x2, y2 = to_screen(self.guessed_position)
 
         pygame.draw.line(self.screen, color, (int(x1), int(y1)), (int(x2), int(y2)), width)
 
         mid_x = (x1 + x2) / 2
         mid_y = (y1 + y2) / 2
 
-        score = self.get_score(self.guessed_position)
-        text_value = f"{score:.3f}"
+        if self.score_text is None:
+            self.get_score(self.guessed_position)
 
         if font is None:
-            font = pygame.font.SysFont("Arial", 24, bold=True)
+            font = get_font("Arial", 24, bold=True)
 
-        text_surface = font.render(text_value, True, color)
+        text_surface = render_text(font, self.score_text, color)
         text_rect = text_surface.get_rect(center=(mid_x, mid_y - 10))
 
-        self.screen.blit(text_surface, text_rect)
\ No newline at end of file
+        self.screen.blit(text_surface, text_rect)
@@ -0,0 +1,94 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from src.surface_budget import PRIORITY_PREFETCH, PRIORITY_VISIBLE, surface_budget
+
+# Evento postado quando uma imagem termina de ser decodificada
+IMAGE_READY = pygame.event.custom_type()
+
+
+class ImagePrefetcher:
+    """Decodifica em segundo plano as imagens de todas as rodadas da sessão.
+
+    As fotos entram no orçamento de memória (`surface_budget`) com prioridade de
+    prefetch: se faltar memória, voltam para a camada comprimida até a rodada delas.
+    """
+
+    def __init__(self, paths, workers=1, budget=surface_budget, target_width=None):
+        self.paths = list(paths)
+        self.budget = budget
+        self.target_width = target_width  # Largura da janela: JPEGs saem reduzidos pela DCT
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self._requested_at = {}
+        self._ready_at = {}
+        self._futures = []
+        for index, path in enumerate(self.paths):
+            future = self._executor.submit(self._decode, path)
+            future.add_done_callback(lambda f, i=index: self._on_done(i))
+            self._futures.append(future)
+
+    def _decode(self, path):
+        """Lê e decodifica a imagem fora da thread principal (sem convert)."""
+        image = self.budget.load(path, PRIORITY_PREFETCH, self.target_width)
+        image.decode()
+        if self._closed:
+            self.budget.discard(image)
+        return image
+
+    def _on_done(self, index):
+        self._ready_at[index] = time.perf_counter()
+        # pygame.event.post pode ser chamado de outra thread
+        if pygame.display.get_init():
+            pygame.event.post(pygame.event.Event(IMAGE_READY, index=index))
+
+    def is_ready(self, index):
+        return self._futures[index].done()
+
+    def get(self, index, placeholder_size=None):
+        """Retorna (superfície, pronta). Se ainda não decodificou, devolve um placeholder.
+
+        Passe `placeholder_size` (o tamanho da janela): com `--renderer=texture` a
+        superfície do display é a janela escondida de 1x1.
+        """
+        self._requested_at.setdefault(index, time.perf_counter())
+
+        future = self._futures[index]
+        if future.done():
+            return self.result(index), True
+
+        placeholder = pygame.Surface(placeholder_size or pygame.display.get_surface().get_size())
+        placeholder.fill((10, 20, 40))
+        return placeholder, False
+
+    def result(self, index):
+        """Espera a decodificação terminar e retorna a superfície convertida."""
+        image = self._futures[index].result()
+        image.priority = PRIORITY_VISIBLE
+        return image.surface
+
+    def finish(self, index):
+        """A rodada acabou: a foto sai do orçamento (inclusive da camada comprimida)."""
+        future = self._futures[index]
+        if future.done() and not future.cancelled() and future.exception() is None:
+            self.budget.discard(future.result())
+
+    def wait_time(self, index):
+        """Tempo (s) que a rodada esperou pela imagem depois de pedi-la."""
+        requested = self._requested_at.get(index)
+        ready = self._ready_at.get(index)
+        if requested is None or ready is None:
+            return None
+        return max(0.0, ready - requested)
+
+    def close(self):
+        self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for future in self._futures:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self.budget.discard(future.result())
+        # Os futures (com as fotos decodificadas) e os callbacks formam um ciclo com
+        # o prefetcher: solta as fotos já, sem esperar o coletor de ciclos
+        self._futures = []
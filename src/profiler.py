@@ -0,0 +1,229 @@
+import atexit
+import csv
+import json
+import time
+from collections import deque
+
+DEFAULT_DUMP_PATH = "frame_profile"
+
+
+class _NullStage:
+    """Cronômetro vazio usado quando o profiler está desligado."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        current = self.profiler._current
+        current[self.name] = current.get(self.name, 0.0) + elapsed
+        return False
+
+
+def percentile(values, p):
+    """Percentil `p` (0-100) de uma lista já ordenada."""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+
+class FrameProfiler:
+    """Tempo por etapa de cada frame, guardado num buffer circular.
+
+    Desligado, `stage()` devolve sempre o mesmo objeto vazio, então pode ficar
+    no código de produção. F3 liga/desliga o HUD (e a medição junto, a menos
+    que ela já estivesse ligada por `--profile-frames`).
+    """
+
+    def __init__(self, history=600):
+        self.enabled = False
+        self.hud_visible = False
+        self.history = history
+        self.frames = deque(maxlen=history)  # (duração do frame, {etapa: duração})
+        self.dump_path = None
+        self._current = {}
+        self._frame_start = None
+        self._hud_surface = None
+        self._hud_frame = -1
+        self._frame_count = 0
+        self._enabled_by_hud = False  # A medição só está ligada porque o HUD foi aberto
+        self.screens = {}  # tela -> quadros e área suja somados dos DirtyTracker dela
+
+    def enable(self, dump_path=None):
+        self.enabled = True
+        self._enabled_by_hud = False
+        if dump_path:
+            self.dump_path = dump_path
+
+    def configure(self, argv):
+        """Liga a medição com `--profile-frames[=caminho]` e grava o resumo ao sair."""
+        for arg in argv:
+            if arg == "--profile-frames" or arg.startswith("--profile-frames="):
+                path = arg.partition("=")[2] or DEFAULT_DUMP_PATH
+                self.enable(path)
+                atexit.register(self.dump)
+
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def begin_frame(self):
+        if self.enabled:
+            self._current = {}
+            self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled or self._frame_start is None:
+            return
+        self.frames.append((time.perf_counter() - self._frame_start, self._current))
+        self._frame_start = None
+        self._frame_count += 1
+
+    def handle_event(self, event):
+        """Trata a tecla do HUD. Retorna True se o evento foi usado."""
+        import pygame
+
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.hud_visible = not self.hud_visible
+            if self.hud_visible and not self.enabled:
+                self.enabled = True
+                self._enabled_by_hud = True
+            elif not self.hud_visible and self._enabled_by_hud:
+                # Fechou o HUD: volta a custar nada, como antes do F3
+                self.enabled = False
+                self._enabled_by_hud = False
+                self._frame_start = None
+            return True
+        return False
+
+    def record_screen(self, name, dirty):
+        """Soma o `DirtyTracker` de uma tela que terminou; com a medição ligada, mostra no terminal.
+
+        É o que mostra a economia da tela parada: quadros ociosos não desenham nada.
+        Com o HUD aberto não há quadro ocioso (o painel é redesenhado todo quadro).
+        """
+        stats = dirty.stats()
+        total = self.screens.setdefault(name, {"frames": 0, "idle_frames": 0, "dirty_area": 0})
+        total["frames"] += stats["frames"]
+        total["idle_frames"] += stats["idle_frames"]
+        total["dirty_area"] += dirty.total_dirty_area
+        if self.enabled and stats["frames"]:
+            print(f"{name}: {stats['idle_frames']}/{stats['frames']} quadros sem desenho "
+                  f"({100 * stats['idle_frames'] / stats['frames']:.0f}%), "
+                  f"área suja média {stats['avg_dirty_area']:.0f} px por quadro desenhado")
+
+    def screen_summary(self):
+        """Por tela: quadros, fração ociosa e área suja média dos quadros desenhados."""
+        summary = {}
+        for name, total in sorted(self.screens.items()):
+            drawn = total["frames"] - total["idle_frames"]
+            summary[name] = {
+                "frames": total["frames"],
+                "idle_frames": total["idle_frames"],
+                "idle_fraction": total["idle_frames"] / total["frames"] if total["frames"] else 0.0,
+                "avg_dirty_area": total["dirty_area"] / drawn if drawn else 0,
+            }
+        return summary
+
+    def summary(self):
+        """p50/p95/p99 (ms) do frame inteiro e de cada etapa."""
+        frame_times = sorted(frame for frame, _ in self.frames)
+        stages = {}
+        for _, frame_stages in self.frames:
+            for name, elapsed in frame_stages.items():
+                stages.setdefault(name, []).append(elapsed)
+
+        def describe(values):
+            values = sorted(values)
+            return {
+                "count": len(values),
+                "mean_ms": sum(values) * 1000 / len(values) if values else 0.0,
+                "p50_ms": percentile(values, 50) * 1000,
+                "p95_ms": percentile(values, 95) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+            }
+
+        return {
+            "frame": describe(frame_times),
+            "stages": {name: describe(values) for name, values in sorted(stages.items())},
+            "screens": self.screen_summary(),
+        }
+
+    def hud_rect(self):
+        import pygame
+
+        return pygame.Rect(8, 8, 300, 36 + 18 * 8)
+
+    def draw_hud(self, screen):
+        """Desenha o painel com os percentis no canto superior esquerdo."""
+        if not self.hud_visible:
+            return
+        import pygame
+        from src.text_cache import get_font
+
+        # O resumo ordena o histórico inteiro: recalcula só a cada 10 frames
+        if self._hud_surface is None or self._frame_count - self._hud_frame >= 10:
+            self._hud_frame = self._frame_count
+            summary = self.summary()
+            font = get_font("Consolas", 14)
+            rect = self.hud_rect()
+            surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+            surface.fill((0, 0, 0, 170))
+
+            frame = summary["frame"]
+            lines = [
+                f"frame p50 {frame['p50_ms']:.1f}  p95 {frame['p95_ms']:.1f}  p99 {frame['p99_ms']:.1f} ms",
+                f"{'etapa':<12}{'p50':>8}{'p95':>8}{'p99':>8}",
+            ]
+            slowest = sorted(summary["stages"].items(), key=lambda item: item[1]["p95_ms"], reverse=True)
+            for name, stats in slowest[:7]:
+                lines.append(f"{name:<12}{stats['p50_ms']:8.2f}{stats['p95_ms']:8.2f}{stats['p99_ms']:8.2f}")
+
+            for i, line in enumerate(lines):
+                # Texto muda a cada atualização: não vale a pena passar pelo cache
+                surface.blit(font.render(line, True, (0, 255, 0)), (8, 6 + i * 18))
+            self._hud_surface = surface
+
+        screen.blit(self._hud_surface, self.hud_rect())
+
+    def dump(self, path=None):
+        """Grava o resumo em JSON e os frames em CSV (`path`.json / `path`.csv)."""
+        path = path or self.dump_path
+        if not path or not self.frames:
+            return
+        with open(path + ".json", "w") as file:
+            json.dump(self.summary(), file, indent=2)
+
+        names = sorted({name for _, stages in self.frames for name in stages})
+        with open(path + ".csv", "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["frame_ms"] + [f"{name}_ms" for name in names])
+            for frame, stages in self.frames:
+                writer.writerow([f"{frame * 1000:.3f}"] + [f"{stages.get(name, 0.0) * 1000:.3f}" for name in names])
+        print(f"Perfil de frames salvo em {path}.json e {path}.csv")
+
+
+# Profiler compartilhado por todas as telas
+profiler = FrameProfiler()
@@ -0,0 +1,221 @@
+"""Backends de desenho da janela.
+
+- `surface` (padrão): tudo é desenhado na superfície da janela com blit e as
+  imagens grandes são escaladas na CPU (tiles do `Viewport`, mini mapa).
+- `texture` (`--renderer=texture`): usa o Renderer do SDL2
+  (`pygame._sdl2.video`). Cada imagem vira uma textura uma única vez e o
+  renderer recorta/escala na hora de copiar para a janela. Funciona com o
+  renderer por software do SDL, sem GPU (`--renderer=texture-gpu` tenta o
+  acelerado). Textos, botões e os desenhos do `Place` continuam sendo feitos
+  com pygame.draw numa camada transparente (`screen`), enviada por cima.
+
+As telas desenham na `screen` devolvida por `open`/`resize` e fecham o quadro
+com `present`, independente do backend.
+"""
+import os
+import weakref
+from collections import OrderedDict
+
+import pygame
+
+from src.surface_budget import surface_budget, surface_bytes
+
+BACKENDS = ("surface", "texture", "texture-gpu")
+
+
+class SurfaceBackend:
+    """O caminho de sempre: desenha direto na superfície da janela."""
+
+    name = "surface"
+
+    def open(self, size, caption=None):
+        screen = pygame.display.set_mode(size, pygame.RESIZABLE)
+        if caption:
+            pygame.display.set_caption(caption)
+        return screen
+
+    def resize(self, size):
+        return pygame.display.set_mode(size, pygame.RESIZABLE)
+
+    def begin(self, screen, dirty):
+        return dirty.begin(screen)
+
+    def draw_viewport(self, screen, viewport):
+        viewport.draw(screen)
+
+    def draw_minimap(self, screen, minimap, image, is_map_image, WIN_WIDTH, WIN_HEIGHT):
+        return minimap.draw(screen, image, is_map_image, WIN_WIDTH, WIN_HEIGHT)
+
+    def draw_sprite(self, screen, image, rect):
+        """Desenha `image` escalada para `rect` (ex.: o pin)."""
+        rect = pygame.Rect(rect)
+        screen.blit(pygame.transform.scale(image, rect.size), rect.topleft)
+
+    def present(self, screen, dirty):
+        dirty.present(screen)
+
+    def close(self):
+        pass
+
+
+class TextureCache:
+    """Texturas das imagens originais, uma por imagem (LRU, limitado por bytes)."""
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.uploads = 0
+        self._entries = OrderedDict()  # id(imagem) -> (ref fraca, textura, bytes)
+
+    def get(self, renderer, image):
+        from pygame._sdl2.video import Texture
+
+        key = id(image)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0]() is image:
+            self._entries.move_to_end(key)
+            return entry[1]
+        if entry is not None:
+            self._remove(key)
+
+        texture = Texture.from_surface(renderer, image)
+        nbytes = surface_bytes(image)
+        self._entries[key] = (weakref.ref(image), texture, nbytes)
+        self.current_bytes += nbytes
+        self.uploads += 1
+        self.shrink(self.max_bytes, keep=1)
+        return texture
+
+    def shrink(self, max_bytes, keep=0):
+        """Descarta as texturas menos usadas (e as de imagens que já sumiram)."""
+        for key in [k for k, entry in self._entries.items() if entry[0]() is None]:
+            self._remove(key)
+        while self.current_bytes > max_bytes and len(self._entries) > keep:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def _remove(self, key):
+        _, _, nbytes = self._entries.pop(key)
+        self.current_bytes -= nbytes
+
+
+class TextureBackend:
+    """Renderer do SDL2: as imagens grandes são escaladas na cópia para a janela.
+
+    A janela de verdade é uma `Window` do SDL2 com o Renderer; a janela do
+    módulo display fica escondida (1x1) só para o convert() continuar valendo.
+    """
+
+    name = "texture"
+
+    def __init__(self, accelerated=False):
+        self.accelerated = accelerated
+        self.textures = TextureCache()
+        self.window = None
+        self.renderer = None
+        self._layer = None  # Textura da camada transparente (screen)
+        self._queue = []    # (textura, origem, destino) do quadro atual, em ordem
+
+    def open(self, size, caption=None):
+        from pygame._sdl2.video import Renderer, Window
+
+        # Escala linear na cópia (o padrão do SDL é "nearest")
+        os.environ.setdefault("SDL_RENDER_SCALE_QUALITY", "linear")
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode((1, 1), pygame.HIDDEN)
+        self.window = Window(caption or "", size)
+        self.renderer = Renderer(self.window, accelerated=1 if self.accelerated else 0)
+        # As texturas são cópias das originais: entram no orçamento como um cache derivado
+        surface_budget.register_cache("textures", self.textures, priority=1)
+        return self.resize(size)
+
+    def resize(self, size):
+        from pygame._sdl2.video import Texture
+
+        self.window.size = size
+        self._layer = Texture(self.renderer, size, streaming=True)
+        self._layer.blend_mode = pygame.BLENDMODE_BLEND
+        return pygame.Surface(size, pygame.SRCALPHA)
+
+    def begin(self, screen, dirty):
+        if not dirty.begin(screen):
+            return False
+        # A composição é refeita inteira: limpa a camada e ignora o clip das regiões
+        screen.set_clip(None)
+        screen.fill((0, 0, 0, 0))
+        self._queue = []
+        return True
+
+    def draw_viewport(self, screen, viewport):
+        image = viewport.image
+        scale = viewport.scale
+        img_width, img_height = image.get_size()
+        win_width, win_height = viewport.window
+
+        # Pedaço da original que aparece na janela (arredondado para fora)
+        x0, y0 = viewport.screen_to_image((0, 0))
+        x1, y1 = viewport.screen_to_image((win_width, win_height))
+        x0, y0 = max(0, int(x0)), max(0, int(y0))
+        x1, y1 = min(img_width, int(x1) + 1), min(img_height, int(y1) + 1)
+        source = pygame.Rect(x0, y0, x1 - x0, y1 - y0)
+        left, top = viewport.image_to_screen((x0, y0))
+        target = pygame.Rect(round(left), round(top), round(source.width * scale), round(source.height * scale))
+        self._queue.append((self.textures.get(self.renderer, image), source, target))
+
+    def draw_minimap(self, screen, minimap, image, is_map_image, WIN_WIDTH, WIN_HEIGHT):
+        target = minimap.zoomed_rect(image, is_map_image, WIN_WIDTH, WIN_HEIGHT)
+        source = minimap.source_rect(image, is_map_image)
+        self._queue.append((self.textures.get(self.renderer, image), source, target))
+        pygame.draw.rect(screen, (255, 255, 255), target.inflate(4, 4), 2)
+        return target.x, target.y, target.width, target.height
+
+    def draw_sprite(self, screen, image, rect):
+        self._queue.append((self.textures.get(self.renderer, image), None, pygame.Rect(rect)))
+
+    def present(self, screen, dirty):
+        renderer = self.renderer
+        renderer.draw_color = (0, 0, 0, 255)
+        renderer.clear()
+        for texture, source, target in self._queue:
+            texture.draw(srcrect=source, dstrect=target)
+        self._layer.update(screen)
+        self._layer.draw()
+        renderer.present()
+        self._queue = []
+        dirty.present(screen, update=False)
+
+    def close(self):
+        self.textures.invalidate()
+        self._layer = None
+        self.renderer = None
+        if self.window is not None:
+            self.window.destroy()
+            self.window = None
+
+
+class Display:
+    """Backend escolhido na inicialização (`--renderer=surface|texture|texture-gpu`)."""
+
+    def __init__(self):
+        self.backend = SurfaceBackend()
+
+    def configure(self, argv):
+        for arg in argv:
+            if arg.startswith("--renderer="):
+                self.use(arg.split("=", 1)[1])
+
+    def use(self, name):
+        if name not in BACKENDS:
+            raise ValueError(f"Renderer desconhecido: {name} (opções: {', '.join(BACKENDS)})")
+        self.backend.close()
+        self.backend = SurfaceBackend() if name == "surface" else TextureBackend(name == "texture-gpu")
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+
+# Backend compartilhado pelas telas
+display = Display()
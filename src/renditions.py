@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+
+GUESSING_DIR = os.path.join("assets", "guessing")
+CACHE_DIR = os.path.join("assets", "cache", "renditions")
+MANIFEST_NAME = "manifest.json"
+RENDITION_WIDTHS = (1280, 1920, 2560)
+
+_manifest_cache = {}
+
+
+def file_hash(path):
+    """Calcula o sha1 do arquivo, lendo em blocos."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest(cache_dir=CACHE_DIR):
+    """Lê o manifesto das versões reduzidas (vazio se ainda não existir)."""
+    path = os.path.join(cache_dir, MANIFEST_NAME)
+    try:
+        with open(path, "r") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(manifest, cache_dir=CACHE_DIR):
+    """Grava o manifesto de forma atômica."""
+    path = os.path.join(cache_dir, MANIFEST_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _needs_rebuild(entry, source_path, cache_dir, widths):
+    """Diz se a foto precisa ser gerada de novo. Retorna (precisa, hash)."""
+    if not entry:
+        return True, None
+
+    missing = [w for w in entry.get("widths", {}).values()
+               if not os.path.exists(os.path.join(cache_dir, w))]
+    if missing or entry.get("requested_widths") != list(widths):
+        return True, None
+
+    if entry.get("mtime") == os.path.getmtime(source_path):
+        return False, entry.get("sha1")
+
+    # mtime mudou: só refaz se o conteúdo também mudou
+    digest = file_hash(source_path)
+    return digest != entry.get("sha1"), digest
+
+
+def _remove_files(entry, cache_dir, keep=()):
+    """Apaga as versões reduzidas de uma entrada do manifesto (menos as de `keep`)."""
+    for file_name in (entry or {}).get("widths", {}).values():
+        if file_name not in keep:
+            try:
+                os.remove(os.path.join(cache_dir, file_name))
+            except FileNotFoundError:
+                pass
+
+
+def _render_one(job):
+    """Gera as versões reduzidas de uma foto (executa em outro processo)."""
+    import pygame
+
+    name, source_path, cache_dir, widths, digest = job
+    image = pygame.image.load(source_path)
+    src_w, src_h = image.get_size()
+    base, ext = os.path.splitext(name)
+
+    rendered = {}
+    for width in widths:
+        # Não faz sentido ampliar: a original já cobre essa largura
+        if width >= src_w:
+            continue
+        height = round(src_h * width / src_w)
+        out_name = f"{base}_{width}{ext}"
+        scaled = pygame.transform.smoothscale(image, (width, height))
+        pygame.image.save(scaled, os.path.join(cache_dir, out_name))
+        rendered[str(width)] = out_name
+
+    return name, {
+        "mtime": os.path.getmtime(source_path),
+        "sha1": digest or file_hash(source_path),
+        "size": [src_w, src_h],
+        "requested_widths": list(widths),
+        "widths": rendered,
+    }
+
+
+def build_renditions(names, source_dir=GUESSING_DIR, cache_dir=CACHE_DIR,
+                     widths=RENDITION_WIDTHS, workers=None, force=False, prune=True):
+    """Gera (em paralelo) as versões reduzidas das fotos que mudaram.
+
+    `names` é a lista completa de fotos do jogo: as que não estão nela saem do
+    manifesto e têm os arquivos apagados. Num build parcial (só algumas fotos),
+    use `prune=False` para não mexer nas outras.
+
+    Retorna a quantidade de fotos refeitas.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest = load_manifest(cache_dir)
+    widths = sorted(widths)
+
+    jobs = []
+    for name in names:
+        source_path = os.path.join(source_dir, name)
+        if not os.path.exists(source_path):
+            continue
+        if force:
+            rebuild, digest = True, None
+        else:
+            rebuild, digest = _needs_rebuild(manifest.get(name), source_path, cache_dir, widths)
+        if rebuild:
+            jobs.append((name, source_path, cache_dir, widths, digest))
+        elif digest and manifest[name]["mtime"] != os.path.getmtime(source_path):
+            manifest[name]["mtime"] = os.path.getmtime(source_path)
+
+    if jobs:
+        from concurrent.futures import ProcessPoolExecutor  # Só o build usa
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for name, entry in pool.map(_render_one, jobs):
+                # Larguras que deixaram de ser geradas não ficam órfãs na pasta
+                _remove_files(manifest.get(name), cache_dir, keep=set(entry["widths"].values()))
+                manifest[name] = entry
+
+    if prune:
+        # Remove fotos que não fazem mais parte do jogo (manifesto e arquivos)
+        wanted = set(names)
+        for name in [name for name in manifest if name not in wanted]:
+            _remove_files(manifest.pop(name), cache_dir)
+
+    save_manifest(manifest, cache_dir)
+    _manifest_cache.pop(cache_dir, None)
+    return len(jobs)
+
+
+def pick_rendition(name, window_width, source_dir=GUESSING_DIR, cache_dir=CACHE_DIR):
+    """Retorna o caminho da menor versão que cobre `window_width` (ou a original)."""
+    original = os.path.join(source_dir, name)
+    if window_width is None:
+        return original
+
+    if cache_dir not in _manifest_cache:
+        _manifest_cache[cache_dir] = load_manifest(cache_dir)
+    entry = _manifest_cache[cache_dir].get(name)
+    if not entry:
+        return original
+
+    for width in sorted(int(w) for w in entry["widths"]):
+        if width >= window_width:
+            path = os.path.join(cache_dir, entry["widths"][str(width)])
+            if os.path.exists(path):
+                return path
+            break
+    return original
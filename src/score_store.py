@@ -0,0 +1,137 @@
+import csv
+import os
+import queue
+import sqlite3
+import threading
+
+DB_PATH = os.path.join("assets", "scores.db")
+CSV_PATH = os.path.join("assets", "scores.csv")
+COLUMNS = ("name", "points", "time", "date")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    points REAL NOT NULL,
+    time REAL NOT NULL,
+    date TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def connect(db_path=DB_PATH):
+    """Abre o banco em modo WAL; vários processos podem escrever ao mesmo tempo."""
+    connection = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute("PRAGMA busy_timeout=30000")
+    return connection
+
+
+class ScoreStore:
+    """Histórico de pontuações em SQLite. Cada partida é um INSERT (O(1))."""
+
+    def __init__(self, db_path=DB_PATH, csv_path=CSV_PATH):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = connect(db_path)
+        self.connection.executescript(_SCHEMA)
+        if csv_path:
+            self.import_csv(csv_path)
+
+    def import_csv(self, csv_path):
+        """Importa o histórico antigo do CSV (só na primeira vez). Retorna as linhas importadas."""
+        if not os.path.exists(csv_path):
+            return 0
+
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            done = connection.execute("SELECT value FROM meta WHERE key = 'csv_imported'").fetchone()
+            if done:
+                connection.execute("COMMIT")
+                return 0
+
+            with open(csv_path, newline="") as file:
+                rows = [
+                    (row["name"], float(row["points"]), float(row["time"]), row["date"])
+                    for row in csv.DictReader(file)
+                    if row.get("name") is not None
+                ]
+            connection.executemany("INSERT INTO scores (name, points, time, date) VALUES (?, ?, ?, ?)", rows)
+            connection.execute("INSERT INTO meta (key, value) VALUES ('csv_imported', ?)", (csv_path,))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return len(rows)
+
+    def add(self, name, points, time, date):
+        """Registra uma partida."""
+        self.connection.execute(
+            "INSERT INTO scores (name, points, time, date) VALUES (?, ?, ?, ?)",
+            (name, float(points), float(time), date),
+        )
+
+    def count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def rows(self):
+        """Itera pelas partidas em ordem de gravação."""
+        return self.connection.execute("SELECT name, points, time, date FROM scores ORDER BY id")
+
+    def export_csv(self, csv_path):
+        """Gera um CSV com o histórico completo (mesmas colunas do arquivo antigo)."""
+        tmp_path = csv_path + ".tmp"
+        with open(tmp_path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(COLUMNS)
+            writer.writerows(self.rows())
+        os.replace(tmp_path, csv_path)
+
+    def close(self):
+        self.connection.close()
+
+
+class ScoreWriter:
+    """Grava as pontuações numa thread separada para não travar a tela final."""
+
+    def __init__(self, db_path=DB_PATH, csv_path=CSV_PATH):
+        self.db_path = db_path
+        self.csv_path = csv_path
+        self.errors = []
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._work, name="score-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, row):
+        """Enfileira uma partida ({"name", "points", "time", "date"})."""
+        self._queue.put(row)
+
+    def _work(self):
+        # A conexão SQLite precisa ser criada na própria thread que a usa;
+        # a importação do CSV antigo (se ainda não foi feita) também fica aqui
+        store = ScoreStore(self.db_path, self.csv_path)
+        try:
+            while True:
+                row = self._queue.get()
+                if row is None:
+                    break
+                try:
+                    store.add(row["name"], row["points"], row["time"], row["date"])
+                except sqlite3.Error as error:
+                    self.errors.append(error)
+                    print(f"Erro ao salvar pontuação: {error}")
+        finally:
+            store.close()
+
+    def close(self, timeout=None):
+        """Espera as gravações pendentes terminarem."""
+        self._queue.put(None)
+        self._thread.join(timeout)
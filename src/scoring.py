@@ -0,0 +1,105 @@
+"""Pontuação em lote com NumPy.
+
+Faz a mesma conta do `Place.get_score` para muitos palpites e locais de uma vez
+(para calibrar a curva com o histórico ou pontuar sessões simuladas).
+
+Palpites têm forma (..., 2) e locais (..., 3) = (x, y, raio); as dimensões da
+frente seguem as regras de broadcasting do NumPy. Para todas as combinações:
+
+    distances, scores = score(guesses[:, None], places[None, :])
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.place import MAX_DISTANCE
+
+
+class LinearCurve:
+    """A curva do jogo: 100 no círculo, caindo em linha reta até 0 em `max_distance`."""
+
+    def __init__(self, max_distance=MAX_DISTANCE):
+        self.max_distance = max_distance
+
+    def __call__(self, distances):
+        scores = np.rint(100 * (1 - distances / self.max_distance))
+        scores = np.where(distances <= 0, 100, np.where(distances >= self.max_distance, 0, scores))
+        return scores.astype(np.int64)
+
+
+class ExponentialCurve:
+    """Cai pela metade a cada `half_distance` (nunca chega a 0 antes de arredondar)."""
+
+    def __init__(self, half_distance=250):
+        self.half_distance = half_distance
+
+    def __call__(self, distances):
+        scores = np.rint(100 * np.exp2(-np.maximum(distances, 0) / self.half_distance))
+        return scores.astype(np.int64)
+
+
+class SteppedCurve:
+    """Faixas fixas: `steps` = [(distância máxima, pontos), ...] em ordem crescente."""
+
+    def __init__(self, steps=((0, 100), (50, 80), (150, 50), (400, 20))):
+        self.limits = np.array([limit for limit, _ in steps], dtype=np.float64)
+        self.points = np.array([points for _, points in steps] + [0], dtype=np.int64)
+
+    def __call__(self, distances):
+        # Primeira faixa cujo limite é >= distância; depois da última, 0 pontos
+        return self.points[np.searchsorted(self.limits, distances, side="left")]
+
+
+LINEAR = LinearCurve()
+
+
+def distances(guesses, places):
+    """Distância de cada palpite até a borda do círculo do local (0 se caiu dentro)."""
+    guesses = np.asarray(guesses, dtype=np.float64)
+    places = np.asarray(places, dtype=np.float64)
+    dx = places[..., 0] - guesses[..., 0]
+    dy = places[..., 1] - guesses[..., 1]
+    # Mesma sequência de operações do Place.get_distance (resultado idêntico)
+    distance = np.sqrt(dx * dx + dy * dy)
+    radius = places[..., 2]
+    return np.where(distance < radius, 0.0, distance - radius)
+
+
+def score(guesses, places, curve=LINEAR):
+    """Retorna (distâncias, pontos) numa única passada vetorizada."""
+    distance = distances(guesses, places)
+    return distance, curve(distance)
+
+
+def score_chunked(guesses, places, curve=LINEAR, chunk_size=1_000_000, workers=None):
+    """Como `score`, para lotes enormes de pares (palpite, local) alinhados no 1º eixo.
+
+    Divide em blocos e usa várias threads: as operações do NumPy soltam o GIL,
+    então os blocos rodam em paralelo sem copiar os dados para outros processos.
+    """
+    guesses = np.asarray(guesses, dtype=np.float64)
+    places = np.asarray(places, dtype=np.float64)
+    n = len(guesses)
+    if places.ndim == 1:
+        # Um único local para todos os palpites
+        places = np.broadcast_to(places, (n, 3))
+    out_distances = np.empty(n, dtype=np.float64)
+    out_scores = np.empty(n, dtype=np.int64)
+
+    def work(start):
+        stop = min(n, start + chunk_size)
+        out_distances[start:stop], out_scores[start:stop] = score(guesses[start:stop], places[start:stop], curve)
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        list(pool.map(work, range(0, n, chunk_size)))
+    return out_distances, out_scores
+
+
+def catalog_places(catalog):
+    """Locais do catálogo como array (n, 3), sem copiar as colunas um por um."""
+    return np.column_stack((
+        np.frombuffer(catalog.xs, dtype=np.float64),
+        np.frombuffer(catalog.ys, dtype=np.float64),
+        np.frombuffer(catalog.radii, dtype=np.float64),
+    ))
@@ -0,0 +1,170 @@
+import heapq
+import math
+from array import array
+
+
+class SpatialGrid:
+    """Índice espacial dos locais anotados numa grade uniforme.
+
+    Cada célula de `cell_size` x `cell_size` (na escala das anotações) guarda os
+    índices dos locais cujo centro cai nela. As buscas só olham as células em
+    volta do ponto, então custam O(locais por perto) em vez de O(n); inserir ou
+    mover um local é O(1), sem reconstruir nada (ao contrário de uma KD-tree).
+    """
+
+    def __init__(self, cell_size=100.0):
+        self.cell_size = cell_size
+        self.xs = array("d")
+        self.ys = array("d")
+        self.radii = array("d")
+        self.max_radius = 0.0
+        self._cells = {}
+        self._cell_of = []
+        self._bounds = None  # (menor coluna, menor linha, maior coluna, maior linha)
+
+    @classmethod
+    def from_catalog(cls, catalog, cell_size=None):
+        """Indexa os locais do catálogo (mesmos índices). Sem `cell_size`, escolhe pela densidade."""
+        if cell_size is None:
+            cell_size = auto_cell_size(catalog.xs, catalog.ys)
+        grid = cls(cell_size)
+        for index in range(len(catalog)):
+            grid.add(catalog.xs[index], catalog.ys[index], catalog.radii[index])
+        return grid
+
+    def __len__(self):
+        return len(self.xs)
+
+    def _cell(self, x, y):
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def _insert(self, index, cell):
+        self._cells.setdefault(cell, []).append(index)
+        if self._bounds is None:
+            self._bounds = (cell[0], cell[1], cell[0], cell[1])
+        else:
+            x0, y0, x1, y1 = self._bounds
+            self._bounds = (min(x0, cell[0]), min(y0, cell[1]), max(x1, cell[0]), max(y1, cell[1]))
+
+    def add(self, x, y, radius=0.0):
+        """Adiciona um local. Retorna o índice (o mesmo do catálogo, se vier dele)."""
+        index = len(self.xs)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.radii.append(radius)
+        self.max_radius = max(self.max_radius, radius)
+        cell = self._cell(x, y)
+        self._cell_of.append(cell)
+        self._insert(index, cell)
+        return index
+
+    def move(self, index, x, y, radius=0.0):
+        """Atualiza a posição/raio de um local já indexado."""
+        old_cell = self._cell_of[index]
+        self.xs[index], self.ys[index], self.radii[index] = x, y, radius
+        self.max_radius = max(self.max_radius, radius)
+        cell = self._cell(x, y)
+        if cell != old_cell:
+            members = self._cells[old_cell]
+            members.remove(index)
+            if not members:
+                del self._cells[old_cell]
+            self._cell_of[index] = cell
+            self._insert(index, cell)
+
+    def _candidates(self, x, y, distance):
+        """Índices nas células que cruzam o quadrado de lado 2 * `distance` em volta do ponto."""
+        col0, row0 = self._cell(x - distance, y - distance)
+        col1, row1 = self._cell(x + distance, y + distance)
+        cells = self._cells
+        if (col1 - col0 + 1) * (row1 - row0 + 1) > len(cells):
+            # Busca maior que o índice inteiro: mais barato olhar só as células ocupadas
+            for (col, row), members in cells.items():
+                if col0 <= col <= col1 and row0 <= row <= row1:
+                    yield from members
+            return
+        for col in range(col0, col1 + 1):
+            for row in range(row0, row1 + 1):
+                members = cells.get((col, row))
+                if members:
+                    yield from members
+
+    def within(self, x, y, distance):
+        """Locais com o centro a no máximo `distance` do ponto."""
+        limit = distance * distance
+        xs, ys = self.xs, self.ys
+        return [i for i in self._candidates(x, y, distance)
+                if (xs[i] - x) ** 2 + (ys[i] - y) ** 2 <= limit]
+
+    def overlapping(self, x, y, radius, exclude=None):
+        """Locais cujo círculo cruza o círculo (x, y, radius)."""
+        xs, ys, radii = self.xs, self.ys, self.radii
+        found = []
+        for i in self._candidates(x, y, radius + self.max_radius):
+            if i == exclude:
+                continue
+            reach = radius + radii[i]
+            if (xs[i] - x) ** 2 + (ys[i] - y) ** 2 < reach * reach:
+                found.append(i)
+        return found
+
+    def nearest(self, x, y, k=1):
+        """Os `k` locais com centro mais perto do ponto: [(distância, índice)], do mais perto ao mais longe."""
+        if not self.xs:
+            return []
+        col, row = self._cell(x, y)
+        x0, y0, x1, y1 = self._bounds
+        max_ring = max(abs(col - x0), abs(col - x1), abs(row - y0), abs(row - y1))
+        xs, ys, cells = self.xs, self.ys, self._cells
+
+        best = []  # heap de (-distância², índice) com os k melhores
+        for ring in range(max_ring + 1):
+            for cell in _ring_cells(col, row, ring):
+                for i in cells.get(cell, ()):
+                    d2 = (xs[i] - x) ** 2 + (ys[i] - y) ** 2
+                    if len(best) < k:
+                        heapq.heappush(best, (-d2, i))
+                    elif d2 < -best[0][0]:
+                        heapq.heapreplace(best, (-d2, i))
+            # Nada fora do quadrado já visitado pode estar mais perto que a borda dele
+            if len(best) == k:
+                size = self.cell_size
+                edge = min(x - (col - ring) * size, (col + ring + 1) * size - x,
+                           y - (row - ring) * size, (row + ring + 1) * size - y)
+                if -best[0][0] <= edge * edge:
+                    break
+        return sorted((math.sqrt(-d2), i) for d2, i in best)
+
+    def duplicates(self, tolerance=1.0):
+        """Grupos de locais com o centro praticamente no mesmo lugar (ex.: anotação padrão repetida)."""
+        seen = set()
+        groups = []
+        for i in range(len(self.xs)):
+            if i in seen:
+                continue
+            group = sorted(self.within(self.xs[i], self.ys[i], tolerance))
+            if len(group) > 1:
+                seen.update(group)
+                groups.append(group)
+        return groups
+
+
+def auto_cell_size(xs, ys, per_cell=2, minimum=1.0, default=100.0):
+    """Lado de célula para ficar com uns `per_cell` locais por célula em média."""
+    if len(xs) < 2:
+        return default
+    area = (max(xs) - min(xs)) * (max(ys) - min(ys))
+    return max(minimum, math.sqrt(area * per_cell / len(xs))) if area > 0 else default
+
+
+def _ring_cells(col, row, ring):
+    """Células na borda do quadrado de raio `ring` (em células) em volta de (col, row)."""
+    if ring == 0:
+        yield col, row
+        return
+    for c in range(col - ring, col + ring + 1):
+        yield c, row - ring
+        yield c, row + ring
+    for r in range(row - ring + 1, row + ring):
+        yield col - ring, r
+        yield col + ring, r
@@ -0,0 +1,80 @@
+"""Medição do tempo de abertura do jogo (--profile-startup).
+
+Este módulo só usa a biblioteca padrão para poder ser importado antes de tudo.
+"""
+import builtins
+import sys
+import time
+
+_start = time.perf_counter()
+_enabled = False
+_budget_ms = None
+_imports = {}
+_marks = []
+_first_frame = None
+_depth = 0
+_original_import = builtins.__import__
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    global _depth
+    # Só mede imports que ainda não foram carregados, e só no nível de cima
+    if _depth or level or name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    _depth += 1
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        _depth -= 1
+        _imports[name] = _imports.get(name, 0.0) + time.perf_counter() - start
+
+
+def begin(argv):
+    """Liga a medição se `--profile-startup` estiver em `argv` (chamar antes dos imports pesados).
+
+    `--startup-budget=MS` define um orçamento para o primeiro frame.
+    """
+    global _enabled, _budget_ms
+    _enabled = "--profile-startup" in argv
+    for arg in argv:
+        if arg.startswith("--startup-budget="):
+            _budget_ms = float(arg.split("=", 1)[1])
+    if _enabled:
+        builtins.__import__ = _timed_import
+
+
+def mark(label):
+    """Registra um marco (ex.: 'pygame.display.init')."""
+    if _enabled:
+        _marks.append((label, time.perf_counter() - _start))
+
+
+def first_frame():
+    """Chamado a cada frame apresentado; só o primeiro conta."""
+    global _first_frame
+    if not _enabled or _first_frame is not None:
+        return
+    _first_frame = time.perf_counter() - _start
+    builtins.__import__ = _original_import
+    report()
+
+
+def report():
+    print("--- Perfil de inicialização ---")
+    print("Imports:")
+    for name, elapsed in sorted(_imports.items(), key=lambda item: item[1], reverse=True):
+        if elapsed >= 0.001:
+            print(f"  {name:<24} {elapsed * 1000:8.1f} ms")
+    print(f"  {'total':<24} {sum(_imports.values()) * 1000:8.1f} ms")
+
+    print("Marcos (desde o início do main.py):")
+    for label, elapsed in _marks:
+        print(f"  {label:<24} {elapsed * 1000:8.1f} ms")
+
+    if _first_frame is not None:
+        print(f"Primeiro frame na tela: {_first_frame * 1000:.1f} ms")
+        if _budget_ms is not None:
+            status = "OK" if _first_frame * 1000 <= _budget_ms else "ACIMA DO ORÇAMENTO"
+            print(f"Orçamento: {_budget_ms:.0f} ms -> {status}")
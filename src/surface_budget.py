@@ -0,0 +1,172 @@
+"""Orçamento de memória de pixels do processo.
+
+Toda imagem original (fotos das rodadas, mapa) é carregada por aqui e os caches
+de superfícies derivadas (tiles, mini mapa...) se registram. Quando a soma passa
+do orçamento, o `enforce()` libera memória nesta ordem:
+
+1. caches derivados, de menor prioridade primeiro, até o piso de cada um;
+2. originais que não estão na tela, de menor prioridade e menos usados primeiro.
+   Essas voltam para a camada comprimida (os bytes do JPEG/PNG, já em memória)
+   e são decodificadas de novo quando alguém pedir a superfície.
+"""
+import os
+import threading
+import time
+
+import pygame
+
+from src.image_loader import load_surface
+
+# Prioridade das originais: as da tela nunca são liberadas
+PRIORITY_IDLE = 0       # Já usada / sem previsão de uso
+PRIORITY_PREFETCH = 1   # Rodadas seguintes, decodificadas adiantado
+PRIORITY_VISIBLE = 2    # Na tela agora
+
+DEFAULT_BUDGET_MB = 512
+
+
+def surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+class ManagedImage:
+    """Imagem original com duas camadas: decodificada ou só os bytes do arquivo."""
+
+    def __init__(self, name, data, priority=PRIORITY_IDLE, target_width=None, alpha=False):
+        self.name = name
+        self.data = data
+        self.priority = priority
+        self.target_width = target_width  # JPEGs são decodificados reduzidos para essa largura
+        self.alpha = alpha  # Mantém a transparência (convert_alpha), ex.: o pin
+        self.decodes = 0
+        self.last_used = time.perf_counter()
+        self._surface = None
+        self._converted = False
+        self._lock = threading.Lock()
+
+    @property
+    def resident(self):
+        return self._surface is not None
+
+    @property
+    def nbytes(self):
+        surface = self._surface
+        return surface_bytes(surface) if surface is not None else 0
+
+    def _load(self):
+        if self._surface is None:
+            self._surface = load_surface(self.data, self.name, self.target_width)
+            self._converted = False
+            self.decodes += 1
+        return self._surface
+
+    def decode(self):
+        """Decodifica os bytes (pode rodar em outra thread; não faz convert)."""
+        with self._lock:
+            return self._load()
+
+    @property
+    def surface(self):
+        """Superfície pronta para desenhar (decodifica de novo se tinha sido liberada)."""
+        with self._lock:
+            self._load()
+            if not self._converted and pygame.display.get_surface() is not None:
+                # convert() só na thread principal, e a versão crua é descartada
+                self._surface = self._surface.convert_alpha() if self.alpha else self._surface.convert()
+                self._converted = True
+            self.last_used = time.perf_counter()
+            return self._surface
+
+    def release(self):
+        """Volta para a camada comprimida. Retorna os bytes liberados."""
+        with self._lock:
+            freed = self.nbytes
+            self._surface = None
+            self._converted = False
+            return freed
+
+
+class SurfaceBudget:
+    """Contabiliza a memória de pixels e aplica o orçamento (em bytes)."""
+
+    def __init__(self, max_bytes=DEFAULT_BUDGET_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.released = 0  # Quantas vezes uma original voltou para a camada comprimida
+        self._images = []
+        self._caches = []  # (nome, cache, prioridade, piso em bytes)
+        self._lock = threading.Lock()
+
+    def configure(self, argv):
+        """Lê `--memory-budget=MB`."""
+        for arg in argv:
+            if arg.startswith("--memory-budget="):
+                self.max_bytes = int(float(arg.split("=", 1)[1]) * 1024 * 1024)
+
+    def load(self, path, priority=PRIORITY_IDLE, target_width=None, alpha=False):
+        """Lê o arquivo para a camada comprimida; a decodificação fica para o primeiro uso."""
+        with open(path, "rb") as file:
+            data = file.read()
+        image = ManagedImage(os.path.basename(path), data, priority, target_width, alpha)
+        with self._lock:
+            self._images.append(image)
+        return image
+
+    def discard(self, image):
+        """Esquece a imagem de vez (decodificada e comprimida)."""
+        image.release()
+        with self._lock:
+            if image in self._images:
+                self._images.remove(image)
+
+    def register_cache(self, name, cache, priority=0, min_bytes=0):
+        """Registra um cache derivado. Precisa ter `current_bytes` e `shrink(max_bytes)`."""
+        self._caches = [entry for entry in self._caches if entry[0] != name]
+        self._caches.append((name, cache, priority, min_bytes))
+
+    def usage(self):
+        """Bytes por categoria: originais decodificadas, camada comprimida e cada cache."""
+        with self._lock:
+            images = list(self._images)
+        usage = {
+            "original": sum(image.nbytes for image in images),
+            "compressed": sum(len(image.data) for image in images),
+        }
+        for name, cache, _, _ in self._caches:
+            usage[name] = cache.current_bytes
+        usage["total"] = sum(usage.values())
+        usage["budget"] = self.max_bytes
+        return usage
+
+    def total_bytes(self):
+        with self._lock:
+            images = list(self._images)
+        total = sum(image.nbytes + len(image.data) for image in images)
+        return total + sum(cache.current_bytes for _, cache, _, _ in self._caches)
+
+    def enforce(self):
+        """Libera memória até caber no orçamento. Retorna os bytes liberados."""
+        over = self.total_bytes() - self.max_bytes
+        if over <= 0:
+            return 0
+        freed = 0
+
+        for _, cache, _, min_bytes in sorted(self._caches, key=lambda entry: entry[2]):
+            before = cache.current_bytes
+            cache.shrink(max(min_bytes, before - (over - freed)))
+            freed += before - cache.current_bytes
+            if freed >= over:
+                return freed
+
+        with self._lock:
+            candidates = [image for image in self._images
+                          if image.resident and image.priority < PRIORITY_VISIBLE]
+        for image in sorted(candidates, key=lambda image: (image.priority, image.last_used)):
+            freed += image.release()
+            self.released += 1
+            if freed >= over:
+                break
+        return freed
+
+
+# Orçamento compartilhado pelo jogo
+surface_budget = SurfaceBudget()
@@ -0,0 +1,87 @@
+import weakref
+from collections import OrderedDict
+
+import pygame
+
+
+class ScaledSurfaceCache:
+    """Cache LRU de superfícies redimensionadas, limitado por memória (bytes)."""
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # chave: (id da superfície original, tamanho, smooth)
+        # valor: (referência fraca à original, superfície escalada, bytes)
+        # A referência fraca evita que o cache segure fotos de rodadas antigas.
+        self._entries = OrderedDict()
+
+    def get(self, surface, size, smooth=True):
+        """Retorna `surface` escalada para `size`, reaproveitando o resultado anterior."""
+        size = (int(size[0]), int(size[1]))
+        key = (id(surface), size, smooth)
+
+        entry = self._entries.get(key)
+        # Confere a identidade para não confundir com um id reaproveitado
+        if entry is not None and entry[0]() is surface:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        if size == surface.get_size():
+            scaled = surface
+        elif smooth:
+            scaled = pygame.transform.smoothscale(surface, size)
+        else:
+            scaled = pygame.transform.scale(surface, size)
+
+        nbytes = size[0] * size[1] * scaled.get_bytesize()
+        if entry is not None:
+            self._remove(key)
+        self._entries[key] = (weakref.ref(surface), scaled, nbytes)
+        self.current_bytes += nbytes
+        self._evict()
+        return scaled
+
+    def invalidate(self, surface=None):
+        """Descarta as entradas de `surface` (ou todas, se `surface` for None)."""
+        if surface is None:
+            self._entries.clear()
+            self.current_bytes = 0
+            return
+
+        # Aproveita para limpar entradas cujas originais já foram coletadas
+        stale = [k for k, v in self._entries.items() if v[0]() is surface or v[0]() is None]
+        for key in stale:
+            self._remove(key)
+
+    def stats(self):
+        """Retorna os contadores do cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def shrink(self, max_bytes):
+        """Descarta as entradas menos usadas até ocupar no máximo `max_bytes`."""
+        while self.current_bytes > max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key):
+        _, _, nbytes = self._entries.pop(key)
+        self.current_bytes -= nbytes
+
+    def _evict(self):
+        # Mantém sempre a entrada mais recente, mesmo que sozinha passe do limite
+        while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
@@ -0,0 +1,103 @@
+from collections import OrderedDict
+
+import pygame
+
+from src.profiler import profiler
+
+# Fontes abertas no processo: (nome, tamanho, negrito, itálico) -> Font
+_fonts = {}
+
+
+def get_font(name="Arial", size=32, bold=False, italic=False):
+    """Abre a fonte do sistema uma única vez por processo."""
+    key = (name, size, bold, italic)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size, bold=bold, italic=italic)
+        _fonts[key] = font
+    return font
+
+
+def reset_fonts():
+    """Esquece as fontes abertas (e os textos feitos com elas), ex.: depois de um pygame.quit()."""
+    _fonts.clear()
+    text_cache.clear()
+
+
+class TextCache:
+    """Cache LRU de textos já renderizados (inclusive com contorno).
+
+    Conta os bytes das superfícies (`current_bytes`/`shrink`) para entrar no `surface_budget`.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.current_bytes = 0
+        self._entries = OrderedDict()  # chave -> (superfície, bytes)
+
+    def render(self, font, text, color, antialias=True, border_color=None, border_thickness=0):
+        """Retorna a superfície do texto. Com borda, o contorno já vem composto numa superfície só."""
+        key = (font, text, tuple(color), antialias,
+               tuple(border_color) if border_color else None, border_thickness)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        text_surface = font.render(text, antialias, color)
+        if border_color is None or border_thickness <= 0:
+            surface = text_surface
+        else:
+            surface = _compose_border(font, text, antialias, text_surface, border_color, border_thickness)
+
+        nbytes = surface.get_width() * surface.get_height() * surface.get_bytesize()
+        self._entries[key] = (surface, nbytes)
+        self.current_bytes += nbytes
+        if len(self._entries) > self.max_entries:
+            self._remove_oldest()
+        return surface
+
+    def shrink(self, max_bytes):
+        """Descarta os textos menos usados até ocupar no máximo `max_bytes`."""
+        while self.current_bytes > max_bytes and self._entries:
+            self._remove_oldest()
+
+    def _remove_oldest(self):
+        _, (_, nbytes) = self._entries.popitem(last=False)
+        self.current_bytes -= nbytes
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self.current_bytes}
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+
+def _compose_border(font, text, antialias, text_surface, border_color, border_thickness):
+    """Monta texto + borda em 8 direções numa única superfície transparente."""
+    border_surface = font.render(text, antialias, border_color)
+    t = border_thickness
+    w, h = text_surface.get_size()
+    surface = pygame.Surface((w + 2 * t, h + 2 * t), pygame.SRCALPHA)
+
+    for dx in (-t, 0, t):
+        for dy in (-t, 0, t):
+            if dx or dy:
+                surface.blit(border_surface, (t + dx, t + dy))
+
+    surface.blit(text_surface, (t, t))
+    return surface
+
+
+# Cache compartilhado pelas telas do jogo
+text_cache = TextCache()
+
+
+def render_text(font, text, color, antialias=True, border_color=None, border_thickness=0):
+    with profiler.stage("text"):
+        return text_cache.render(font, text, color, antialias, border_color, border_thickness)
@@ -0,0 +1,67 @@
+import os
+
+from src.renditions import GUESSING_DIR, load_manifest, save_manifest
+
+THUMB_DIR = os.path.join("assets", "cache", "thumbnails")
+THUMB_SIZE = (240, 160)
+
+
+def fit_size(size, box):
+    """Maior tamanho com a proporção de `size` que cabe em `box`."""
+    scale = min(box[0] / size[0], box[1] / size[1])
+    return max(1, round(size[0] * scale)), max(1, round(size[1] * scale))
+
+
+def _thumb_one(job):
+    """Gera a miniatura de uma foto (executa em outro processo)."""
+    import pygame
+
+    name, source_path, cache_dir, box = job
+    image = pygame.image.load(source_path)
+    thumb = pygame.transform.smoothscale(image, fit_size(image.get_size(), box))
+    out_name = os.path.splitext(name)[0] + "_thumb.jpg"
+    pygame.image.save(thumb, os.path.join(cache_dir, out_name))
+    return name, {"mtime": os.path.getmtime(source_path), "file": out_name, "box": list(box)}
+
+
+def build_thumbnails(names, source_dir=GUESSING_DIR, cache_dir=THUMB_DIR, box=THUMB_SIZE, workers=None):
+    """Gera (em paralelo) as miniaturas que faltam ou cuja foto mudou (pelo mtime).
+
+    Retorna o manifesto {nome: entrada}.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest = load_manifest(cache_dir)
+
+    jobs = []
+    for name in names:
+        source_path = os.path.join(source_dir, name)
+        if not os.path.exists(source_path):
+            continue
+        entry = manifest.get(name)
+        if (not entry or entry.get("box") != list(box)
+                or entry.get("mtime") != os.path.getmtime(source_path)
+                or not os.path.exists(os.path.join(cache_dir, entry["file"]))):
+            jobs.append((name, source_path, cache_dir, box))
+
+    if jobs:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for name, entry in pool.map(_thumb_one, jobs):
+                manifest[name] = entry
+        save_manifest(manifest, cache_dir)
+    return manifest
+
+
+def load_thumbnails(names, source_dir=GUESSING_DIR, cache_dir=THUMB_DIR, box=THUMB_SIZE, workers=None):
+    """Miniaturas prontas para desenhar: {nome: Surface}. Gera só as que faltam."""
+    import pygame
+
+    manifest = build_thumbnails(names, source_dir, cache_dir, box, workers)
+    thumbnails = {}
+    for name in names:
+        entry = manifest.get(name)
+        if entry:
+            thumb = pygame.image.load(os.path.join(cache_dir, entry["file"]))
+            thumbnails[name] = thumb.convert() if pygame.display.get_surface() else thumb
+    return thumbnails
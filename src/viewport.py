@@ -0,0 +1,200 @@
+import math
+import weakref
+from collections import OrderedDict
+
+import pygame
+
+# Zoom relativo ao "cabe na largura da janela" (1.0 = visão original do jogo)
+ZOOM_LEVELS = (1.0, 1.5, 2.0, 3.0, 4.0, 6.0)
+
+
+class TileCache:
+    """Cache LRU de tiles já escalados, limitado por memória (bytes)."""
+
+    def __init__(self, max_bytes=96 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # chave: (id da imagem, largura escalada, coluna, linha)
+        # valor: (referência fraca à imagem, tile, bytes)
+        self._entries = OrderedDict()
+
+    def get(self, image, key):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0]() is image:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        return None
+
+    def put(self, image, key, tile):
+        self.misses += 1
+        if key in self._entries:
+            self._remove(key)
+        nbytes = tile.get_width() * tile.get_height() * tile.get_bytesize()
+        self._entries[key] = (weakref.ref(image), tile, nbytes)
+        self.current_bytes += nbytes
+        # Mantém sempre a entrada mais recente, mesmo que sozinha passe do limite
+        while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def shrink(self, max_bytes):
+        """Descarta os tiles menos usados até ocupar no máximo `max_bytes`."""
+        while self.current_bytes > max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, image=None):
+        """Descarta os tiles de `image` (ou todos, se `image` for None)."""
+        if image is None:
+            self._entries.clear()
+            self.current_bytes = 0
+            return
+        stale = [k for k, v in self._entries.items() if v[0]() is image or v[0]() is None]
+        for key in stale:
+            self._remove(key)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def _remove(self, key):
+        _, _, nbytes = self._entries.pop(key)
+        self.current_bytes -= nbytes
+
+
+class Viewport:
+    """Mostra uma imagem em tiles, com zoom e deslocamento (câmera).
+
+    A imagem nunca é escalada inteira: em cada nível de zoom ela é dividida em
+    tiles de `tile_size` pixels (na tela), gerados só quando aparecem e guardados
+    num `TileCache`. Só os tiles que cruzam a janela são desenhados.
+    """
+
+    def __init__(self, tile_size=256, cache=None):
+        self.tile_size = tile_size
+        self.cache = cache or TileCache()
+        self.image = None
+        self.window = (0, 0)
+        self.level = 0
+        self.camera_x = 0
+        self.camera_y = 0
+
+    @property
+    def zoom(self):
+        return ZOOM_LEVELS[self.level]
+
+    @property
+    def scale(self):
+        """Pixels de tela por pixel da imagem original."""
+        return self.window[0] / self.image.get_width() * self.zoom
+
+    @property
+    def scaled_size(self):
+        img_width, img_height = self.image.get_size()
+        return round(img_width * self.scale), round(img_height * self.scale)
+
+    @property
+    def state(self):
+        """O que muda o desenho (para o DirtyTracker)."""
+        return (id(self.image), self.window, self.level, self.camera_x, self.camera_y)
+
+    def set_image(self, image, window):
+        """Troca a imagem (volta ao zoom 1 e ao topo) ou só ajusta ao tamanho da janela."""
+        window = tuple(window)
+        if image is self.image and window == self.window:
+            return
+        if image is not self.image:
+            self.level = 0
+            self.camera_x = self.camera_y = 0
+        self.image = image
+        self.window = window
+        self._clamp()
+
+    def release(self):
+        """Solta a imagem atual e os tiles dela (ex.: fim da partida); os das outras ficam."""
+        if self.image is not None:
+            self.cache.invalidate(self.image)
+        self.image = None
+
+    def pan(self, dx, dy):
+        self.camera_x += dx
+        self.camera_y += dy
+        self._clamp()
+
+    def zoom_at(self, steps, anchor):
+        """Sobe/desce `steps` níveis de zoom mantendo o ponto `anchor` (na tela) parado."""
+        level = max(0, min(len(ZOOM_LEVELS) - 1, self.level + steps))
+        if level == self.level:
+            return False
+        image_x, image_y = self.screen_to_image(anchor)
+        self.level = level
+        self.camera_x = round(image_x * self.scale - anchor[0])
+        self.camera_y = round(image_y * self.scale - anchor[1])
+        self._clamp()
+        return True
+
+    def screen_to_image(self, point):
+        """Ponto da tela -> pixel da imagem original."""
+        scale = self.scale
+        return (point[0] + self.camera_x) / scale, (point[1] + self.camera_y) / scale
+
+    def image_to_screen(self, point):
+        scale = self.scale
+        return point[0] * scale - self.camera_x, point[1] * scale - self.camera_y
+
+    def _clamp(self):
+        scaled_width, scaled_height = self.scaled_size
+        self.camera_x = max(0, min(scaled_width - self.window[0], self.camera_x))
+        self.camera_y = max(0, min(scaled_height - self.window[1], self.camera_y))
+
+    def _tile(self, column, row, scaled_width, scaled_height):
+        key = (id(self.image), scaled_width, column, row)
+        tile = self.cache.get(self.image, key)
+        if tile is not None:
+            return tile
+
+        size = self.tile_size
+        x0, y0 = column * size, row * size
+        x1, y1 = min(x0 + size, scaled_width), min(y0 + size, scaled_height)
+
+        # Recorte correspondente na original (arredondado para fora) e escala só ele
+        img_width, img_height = self.image.get_size()
+        fx, fy = img_width / scaled_width, img_height / scaled_height
+        src_x0, src_y0 = math.floor(x0 * fx), math.floor(y0 * fy)
+        src_x1, src_y1 = min(img_width, math.ceil(x1 * fx)), min(img_height, math.ceil(y1 * fy))
+        source = self.image.subsurface((src_x0, src_y0, src_x1 - src_x0, src_y1 - src_y0))
+
+        # O recorte escalado começa um pouco antes do tile: corta o excesso
+        offset_x, offset_y = round(x0 - src_x0 / fx), round(y0 - src_y0 / fy)
+        out_width = max(round(source.get_width() / fx), offset_x + x1 - x0)
+        out_height = max(round(source.get_height() / fy), offset_y + y1 - y0)
+        scaled = pygame.transform.smoothscale(source, (out_width, out_height))
+        tile = scaled.subsurface((offset_x, offset_y, x1 - x0, y1 - y0)).copy()
+
+        self.cache.put(self.image, key, tile)
+        return tile
+
+    def draw(self, screen):
+        """Desenha os tiles visíveis."""
+        size = self.tile_size
+        scaled_width, scaled_height = self.scaled_size
+        win_width, win_height = self.window
+
+        first_column, first_row = self.camera_x // size, self.camera_y // size
+        last_column = min(scaled_width - 1, self.camera_x + win_width - 1) // size
+        last_row = min(scaled_height - 1, self.camera_y + win_height - 1) // size
+
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                tile = self._tile(column, row, scaled_width, scaled_height)
+                screen.blit(tile, (column * size - self.camera_x, row * size - self.camera_y))